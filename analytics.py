@@ -0,0 +1,92 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from db import read_cache, get_all_projects, get_status_history
+from board import BOARD_STATUSES
+
+# PROJECT ANALYTICS
+# Dihitung dari project_status_history (lihat migrations._add_status_history)
+# dengan operasi pandas per kolom, tanpa loop per project. Hasilnya di-cache di
+# read_cache, jadi dihitung ulang hanya kalau data berubah (atau ganti hari).
+
+WIP_STATUSES = ["On Going", "Waiting BA"]
+DONE_STATUS = "Completed"
+ON_TIME_LABELS = ["On time", "Late", "Overdue (open)", "Unknown"]
+
+
+def status_intervals(history, now):
+    """Satu row per periode project berada di suatu status:
+    project_id, status, entered_at, left_at (NaT = masih di status itu), days."""
+    df = pd.DataFrame(history, columns=["project_id", "status", "entered_at", "backfilled"])
+    df["entered_at"] = pd.to_datetime(df["entered_at"])
+    df["left_at"] = df.groupby("project_id")["entered_at"].shift(-1)
+    df["days"] = (df["left_at"].fillna(now) - df["entered_at"]).dt.total_seconds() / 86400
+    return df
+
+def cycle_time(intervals):
+    # Lama di setiap status (hari); periode backfill tidak punya waktu masuk yang asli
+    measured = intervals[(intervals["status"] != DONE_STATUS) & (intervals["backfilled"] == 0)]
+    stats = measured.groupby("status")["days"].agg(["count", "mean", "median"])
+    return stats.reindex([status for status in BOARD_STATUSES if status != DONE_STATUS]).fillna(0)
+
+def wip_over_time(intervals):
+    # Jumlah project di WIP_STATUSES pada akhir setiap bulan: +1 di bulan masuk,
+    # -1 di bulan keluar, lalu cumsum
+    wip = intervals[intervals["status"].isin(WIP_STATUSES)]
+    if wip.empty:
+        return pd.DataFrame({"month": [], "wip": []})
+    entered = wip["entered_at"].dt.to_period("M")
+    left = wip["left_at"].dropna().dt.to_period("M")
+    months = pd.period_range(entered.min(), pd.Timestamp.now().to_period("M"), freq="M")
+    delta = (
+        entered.value_counts().reindex(months, fill_value=0)
+        - left.value_counts().reindex(months, fill_value=0)
+    )
+    return pd.DataFrame({"month": months.to_timestamp(), "wip": delta.cumsum().to_numpy()})
+
+def pic_load(projects):
+    # Project yang belum selesai per PIC, dipecah per status
+    open_projects = projects[projects["status"] != DONE_STATUS]
+    load = pd.crosstab(open_projects["pic"], open_projects["status"])
+    load = load.reindex(columns=[s for s in BOARD_STATUSES if s in load.columns])
+    load["Total"] = load.sum(axis=1)
+    return load.sort_values("Total", ascending=False)
+
+def on_time_completion(projects, intervals, today):
+    # Tanggal selesai = terakhir kali masuk status Completed (bukan dari backfill)
+    completed = intervals[(intervals["status"] == DONE_STATUS) & (intervals["backfilled"] == 0)]
+    completed_at = completed.groupby("project_id")["entered_at"].max().dt.normalize()
+    df = projects.join(completed_at.rename("completed_at"), on="id")
+    done = (df["status"] == DONE_STATUS).to_numpy()
+    known = df["completed_at"].notna().to_numpy()
+    late = (df["completed_at"] > df["date_end"]).to_numpy()
+    overdue = (df["date_end"] < pd.Timestamp(today)).to_numpy()
+    df["result"] = np.select(
+        [done & known & ~late, done & known & late, done & ~known, ~done & overdue],
+        ["On time", "Late", "Unknown", "Overdue (open)"],
+        default=""
+    )
+    summary = df["result"].value_counts().reindex(ON_TIME_LABELS, fill_value=0)
+    return summary, df[df["result"] != ""]
+
+@read_cache.cached
+def get_analytics(today):
+    """today (YYYY-MM-DD) ikut jadi key cache supaya umur status yang masih
+    berjalan dihitung ulang tiap hari walaupun datanya tidak berubah."""
+    now = pd.Timestamp.now()
+    projects = pd.DataFrame(
+        [(p[0], p[1], p[3], p[4], p[5], p[7]) for p in get_all_projects()],
+        columns=["id", "project_name", "category", "pic", "status", "date_end"]
+    )
+    projects["date_end"] = pd.to_datetime(projects["date_end"])
+    intervals = status_intervals(get_status_history(), now)
+    on_time, on_time_projects = on_time_completion(projects, intervals, date.fromisoformat(today))
+    return {
+        "cycle_time": cycle_time(intervals),
+        "wip": wip_over_time(intervals),
+        "pic_load": pic_load(projects),
+        "on_time": on_time,
+        "on_time_projects": on_time_projects,
+    }
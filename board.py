@@ -0,0 +1,66 @@
+from datetime import date
+
+from db import (
+    BOARD_PAGE_SIZE, get_board_counts, get_board_page,
+    get_documents_completeness, get_deadline_metrics
+)
+
+# BOARD MODEL
+# Data board disiapkan sekali per rerun, lalu tab PROJECT & SERVICE
+# sama-sama render dari model yang sama:
+# {"columns": {category: {status: {"count": n, "projects": [...]}}},
+#  "completeness": {project_id: jumlah dokumen required},
+#  "deadlines": {project_id: (sisa hari, overdue?, % jadwal lewat)}}
+
+BOARD_CATEGORIES = ["PROJECT", "SERVICE"]
+BOARD_STATUSES = ["Not Started", "On Going", "Waiting BA", "Completed"]
+
+
+def _empty_columns():
+    return {
+        category: {status: {"count": 0, "projects": []} for status in BOARD_STATUSES}
+        for category in BOARD_CATEGORIES
+    }
+
+def partition_projects(projects, limits, order="start"):
+    # Satu kali jalan: hitung dan isi halaman setiap kolom sekaligus
+    columns = _empty_columns()
+    if order == "deadline":
+        projects = sorted(projects, key=lambda project: project[7])
+    for project in projects:
+        column = columns.get(project[3], {}).get(project[5])
+        if column is None:
+            continue
+        column["count"] += 1
+        if len(column["projects"]) < limits.get((project[3], project[5]), BOARD_PAGE_SIZE):
+            column["projects"].append(project)
+    return columns
+
+def load_columns(year, limits, order="start"):
+    # Jumlah dari satu GROUP BY category, status; kolom kosong tidak di-query
+    counts = get_board_counts(year)
+    columns = _empty_columns()
+    for category, statuses in columns.items():
+        for status, column in statuses.items():
+            column["count"] = counts.get((category, status), 0)
+            if column["count"]:
+                limit = limits.get((category, status), BOARD_PAGE_SIZE)
+                column["projects"] = get_board_page(year, category, status, limit, order)
+    return columns
+
+def build_board(year, limits, search_results=None, order="start"):
+    if search_results is None:
+        columns = load_columns(year, limits, order)
+    else:
+        columns = partition_projects(search_results, limits, order)
+    visible_ids = tuple(
+        project[0]
+        for statuses in columns.values()
+        for column in statuses.values()
+        for project in column["projects"]
+    )
+    return {
+        "columns": columns,
+        "completeness": get_documents_completeness(visible_ids),
+        "deadlines": get_deadline_metrics(visible_ids, date.today().isoformat()),
+    }
@@ -0,0 +1,50 @@
+import logging
+import threading
+from datetime import datetime
+
+from db import (
+    init_db, get_available_years, get_ongoing_projects_services,
+    get_monthly_project_counts
+)
+from board import build_board
+from integrity import REAP_IN_APP, start_maintenance
+from cleanup import schedule_file_cleanup
+
+# PROCESS STARTUP
+# Streamlit menjalankan ulang script app di setiap interaksi. Semua yang cukup
+# dilakukan sekali per proses (migrasi schema, thread maintenance/cleanup,
+# mengisi read cache) dikumpulkan di startup(), yang setelah sukses pertama
+# kali hanya mengecek satu flag. Rerun berikutnya tinggal mengerjakan view.
+
+logger = logging.getLogger(__name__)
+
+_started = False
+_startup_lock = threading.Lock()
+
+
+def warm_caches():
+    # Query yang dibutuhkan hampir setiap halaman: marquee, filter tahun dan board
+    # tahun berjalan (dengan limit default)
+    get_ongoing_projects_services()
+    get_monthly_project_counts()
+    available_years = get_available_years()
+    current_year = datetime.now().strftime("%Y")
+    if current_year in available_years:
+        build_board(current_year, {})
+
+def startup():
+    global _started
+    if _started:
+        return
+    with _startup_lock:
+        if _started:
+            return
+        # Kalau migrasi gagal, _started tetap False dan rerun berikutnya mencoba lagi
+        init_db()
+        start_maintenance(reap=REAP_IN_APP)
+        schedule_file_cleanup()
+        try:
+            warm_caches()
+        except Exception:
+            logger.exception("Warm-up cache gagal")
+        _started = True
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# READ CACHE
+# Cache hasil query per (fungsi, argumen). Isinya dibuang kalau:
+# - invalidate() dipanggil setelah commit add/edit/delete di proses ini, atau
+# - version_source() (PRAGMA data_version) berubah karena ada tulis dari proses lain.
+# version_source paling sering dicek sekali per STALENESS_CHECK_INTERVAL detik,
+# jadi rerun yang cepat (ganti tab, buka expander) tidak menyentuh database sama sekali.
+# Key berisi argumen mentah (kata kunci search, tuple id, rentang tanggal), jadi
+# jumlah entry dibatasi MAX_ENTRIES; yang paling lama tidak dipakai dibuang dulu (LRU).
+
+STALENESS_CHECK_INTERVAL = 1.0
+MAX_ENTRIES = 512
+
+
+class ReadCache:
+    def __init__(self, version_source, check_interval=STALENESS_CHECK_INTERVAL, max_entries=MAX_ENTRIES):
+        self._version_source = version_source
+        self._check_interval = check_interval
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self._version = None
+        self._checked_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _refresh_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self._check_interval:
+            return
+        version = self._version_source()
+        with self._lock:
+            self._checked_at = now
+            if version != self._version:
+                self._version = version
+                self._entries.clear()
+                self._generation += 1
+
+    def get(self, key, loader):
+        self._refresh_version()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            # Jangan simpan hasil yang sudah basi karena ada invalidate saat loader jalan
+            if generation == self._generation:
+                self._entries[key] = value
+                if len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def cached(self, func):
+        @wraps(func)
+        def wrapper(*args):
+            return self.get((func.__name__, args), lambda: func(*args))
+        wrapper.uncached = func
+        return wrapper
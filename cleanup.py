@@ -0,0 +1,68 @@
+import os
+import time
+import logging
+import threading
+
+import db
+
+# FILE CLEANUP WORKER
+# Delete project/file hanya commit perubahan DB (row + antrian file_deletions)
+# lalu langsung kembali ke UI. Thread ini yang menghapus file dari disk, dengan
+# retry + backoff kalau gagal (file terkunci, storage network putus, dll).
+# Antriannya ada di database, jadi kalau proses mati sebelum selesai, sisa
+# antrian dikerjakan lagi saat app jalan berikutnya.
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 30
+IDLE_POLL = 300
+
+logger = logging.getLogger(__name__)
+
+_worker = None
+_worker_lock = threading.Lock()
+_wakeup = threading.Event()
+
+
+def remove_file(file_path):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+def process_file_deletions(now=None):
+    """Kerjakan antrian yang sudah jatuh tempo. Return jumlah path yang dihapus."""
+    deleted = 0
+    for file_path, attempts in db.get_due_file_deletions(now or time.time(), BATCH_SIZE):
+        try:
+            if db.delete_unreferenced_file(file_path, remove_file):
+                deleted += 1
+        except OSError as e:
+            if attempts + 1 >= MAX_ATTEMPTS:
+                # Menyerah; kalau file masih ada, integrity scan akan menemukannya sebagai orphan
+                logger.error("Gagal hapus %s setelah %d percobaan: %s", file_path, attempts + 1, e)
+                db.finish_file_deletion(file_path)
+            else:
+                db.retry_file_deletion(file_path, time.time() + RETRY_DELAY * 2 ** attempts, str(e))
+    return deleted
+
+def _worker_loop():
+    while True:
+        _wakeup.clear()
+        try:
+            process_file_deletions()
+            next_attempt = db.get_next_file_deletion_time()
+        except Exception:
+            logger.exception("File cleanup gagal")
+            next_attempt = None
+        timeout = IDLE_POLL if next_attempt is None else max(0.0, next_attempt - time.time())
+        _wakeup.wait(min(timeout, IDLE_POLL))
+
+def schedule_file_cleanup():
+    # Dipanggil saat startup dan setelah delete: start worker (sekali per proses) lalu bangunkan
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_worker_loop, name="file-cleanup", daemon=True)
+            _worker.start()
+    _wakeup.set()
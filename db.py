@@ -0,0 +1,601 @@
+import sqlite3
+import re
+import threading
+import queue
+import atexit
+from contextlib import contextmanager
+import migrations
+from cache import ReadCache
+
+# DATABASE ACCESS
+# Streamlit menjalankan ulang script app di setiap interaksi, tapi module yang
+# di-import tetap hidup selama proses berjalan. Pool di bawah dibuat sekali per
+# proses dan koneksinya dipakai ulang oleh semua rerun / script thread.
+
+DB_PATH = 'project_management.db'
+POOL_SIZE = 8
+STATEMENT_CACHE_SIZE = 256
+ACQUIRE_TIMEOUT = 30
+
+PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+]
+
+
+class ConnectionPool:
+    def __init__(self, path=DB_PATH, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._all = []
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._watcher_lock = threading.Lock()
+
+    def _connect(self):
+        # check_same_thread=False: koneksi berpindah antar script thread,
+        # tapi tiap koneksi hanya dipegang satu thread dalam satu waktu.
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._all) < self.size:
+                conn = self._connect()
+                self._all.append(conn)
+                return conn
+        return self._idle.get(timeout=ACQUIRE_TIMEOUT)
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        # Sama seperti `with sqlite3.connect(...) as conn`: commit kalau sukses,
+        # rollback kalau error, lalu koneksi dikembalikan ke pool.
+        conn = self.acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self.release(conn)
+
+    def data_version(self):
+        # PRAGMA data_version berubah setiap ada commit dari koneksi lain, termasuk
+        # koneksi pool sendiri dan proses lain. Karena itu dipakai koneksi khusus
+        # yang tidak pernah menulis.
+        with self._watcher_lock:
+            if self._watcher is None:
+                self._watcher = sqlite3.connect(self.path, check_same_thread=False)
+            return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._watcher_lock:
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+        with self._lock:
+            for conn in self._all:
+                conn.close()
+            self._all = []
+            self._idle = queue.LifoQueue(maxsize=self.size)
+
+
+_pool = ConnectionPool()
+atexit.register(_pool.close)
+
+
+def connection():
+    return _pool.connection()
+
+def data_version():
+    return _pool.data_version()
+
+# Semua read helper di bawah lewat cache ini; semua write helper
+# memanggil read_cache.invalidate() setelah commit.
+read_cache = ReadCache(data_version)
+
+
+# INIT DB
+def init_db():
+    with connection() as conn:
+        return migrations.migrate(conn)
+
+@read_cache.cached
+def get_all_projects():
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM projects")
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_project_details(project_id):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM projects WHERE id=?", (project_id,))
+        return cursor.fetchone()
+
+@read_cache.cached
+def get_available_years():
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT DISTINCT start_year
+            FROM projects
+            ORDER BY start_year DESC
+        """)
+        return [str(row[0]) for row in cursor.fetchall()]
+
+@read_cache.cached
+def get_monthly_project_counts():
+    # Agregat grafik dashboard: satu row per (tahun, bulan), dihitung dari
+    # idx_projects_start_year_month tanpa membaca row projects
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT start_year, start_month, COUNT(*)
+            FROM projects
+            GROUP BY start_year, start_month
+            ORDER BY start_year, start_month
+        """)
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_status_history():
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT project_id, status, changed_at, backfilled
+            FROM project_status_history
+            ORDER BY project_id, changed_at, id
+        """)
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_projects_for_year(year):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT * FROM projects
+            WHERE start_year = ?
+            ORDER BY date_start
+        """, (int(year),))
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_projects_for_month(year, month):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, project_name, customer_name, status, date_start, date_end
+            FROM projects
+            WHERE start_year = ? AND start_month = ?
+            ORDER BY date_start
+        """, (int(year), int(month)))
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_projects_active_between(start_date, end_date):
+    # Project yang rentang date_start..date_end-nya beririsan dengan [start_date, end_date]
+    # (string YYYY-MM-DD), lewat R*Tree projects_interval
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT p.id, p.project_name, p.customer_name, p.category, p.pic,
+                   p.status, p.date_start, p.date_end
+            FROM projects_interval AS i
+            JOIN projects AS p ON p.id = i.id
+            WHERE i.start_day <= CAST(julianday(?) - 2440587.5 AS INTEGER)
+              AND i.end_day >= CAST(julianday(?) - 2440587.5 AS INTEGER)
+            ORDER BY p.date_start, p.id
+        """, (end_date, start_date))
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_project_options_for_year(year):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, project_name, customer_name
+            FROM projects
+            WHERE start_year = ?
+            ORDER BY project_name
+        """, (int(year),))
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_ongoing_projects_services():
+    # Tuple (hashable) supaya bisa jadi key ui.marquee_html; idx_projects_status_start
+    # sudah urut per date_start, jadi tidak ada sort
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT project_name, category, pic
+            FROM projects
+            WHERE status = 'On Going'
+            ORDER BY date_start DESC
+        """)
+        return tuple(cursor.fetchall())
+
+# BOARD
+# Kolom board hanya mengambil BOARD_PAGE_SIZE project pertama; sisanya lewat "Load more"
+BOARD_PAGE_SIZE = 10
+
+@read_cache.cached
+def get_board_counts(year):
+    # {(category, status): jumlah} untuk satu tahun, dalam satu query
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT category, status, COUNT(*)
+            FROM projects
+            WHERE start_year = ?
+            GROUP BY category, status
+        """, (int(year),))
+        return {(category, status): count for category, status, count in cursor.fetchall()}
+
+BOARD_ORDERS = {
+    "start": "date_start",
+    "deadline": "date_end",
+}
+
+@read_cache.cached
+def get_board_page(year, category, status, limit, order="start"):
+    # order "deadline": deadline terdekat dulu (idx_projects_board_deadline)
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT * FROM projects
+            WHERE start_year = ? AND category = ? AND status = ?
+            ORDER BY {BOARD_ORDERS[order]}
+            LIMIT ?
+        """, (int(year), category, status, limit))
+        return cursor.fetchall()
+
+# SEARCH (FTS5)
+def _fts_query(term):
+    # Setiap kata jadi prefix match ("kata"*), semua kata harus ada (AND).
+    # Tanda kutip/operator dari input user dibuang supaya MATCH tidak error.
+    tokens = re.findall(r"\w+", term.lower())
+    return " ".join(f'"{token}"*' for token in tokens)
+
+@read_cache.cached
+def search_projects(term, year=None):
+    match = _fts_query(term)
+    if not match:
+        return get_projects_for_year(year) if year is not None else get_all_projects()
+    query = """
+        SELECT projects.* FROM projects_fts
+        JOIN projects ON projects.id = projects_fts.rowid
+        WHERE projects_fts MATCH ?
+    """
+    params = [match]
+    if year is not None:
+        query += " AND projects.start_year = ?"
+        params.append(int(year))
+    query += " ORDER BY projects_fts.rank"
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_project_files(project_id, file_type="All", search_query=""):
+    # Dipakai tab File Preview: filter jenis file + search nama/kategori file via FTS
+    match = _fts_query(search_query)
+    if match:
+        query = """
+            SELECT project_files.file_name, project_files.file_path,
+                   project_files.file_category, project_files.id,
+                   project_files.file_size, project_files.file_missing
+            FROM project_files_fts
+            JOIN project_files ON project_files.id = project_files_fts.rowid
+            WHERE project_files_fts MATCH ? AND project_files.project_id=?
+        """
+        params = [match, project_id]
+    else:
+        query = """
+            SELECT file_name, file_path, file_category, id, file_size, file_missing
+            FROM project_files
+            WHERE project_id=?
+        """
+        params = [project_id]
+    if file_type == "Required Documents":
+        query += " AND project_files.file_category NOT LIKE 'Additional:%'"
+    elif file_type == "Additional Files":
+        query += " AND project_files.file_category LIKE 'Additional:%'"
+    if match:
+        query += " ORDER BY project_files_fts.rank"
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor.fetchall()
+
+@read_cache.cached
+def get_additional_files(project_id):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, file_name, file_path, file_category, file_size, file_missing
+            FROM project_files
+            WHERE project_id=? AND file_category LIKE 'Additional:%'
+            ORDER BY file_category
+        """, (project_id,))
+        return cursor.fetchall()
+
+# ADD / EDIT PROJECT
+# start_year & start_month selalu diisi dari date_start di sini, supaya
+# kolom index-nya tidak pernah beda dengan tanggalnya.
+def insert_project(project_name, customer_name, category, pic, status,
+                   date_start, date_end, no_po, no_bast):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT INTO projects (
+                project_name, customer_name, category, pic, status,
+                date_start, date_end, no_po, no_bast, start_year, start_month
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            project_name, customer_name, category, pic, status,
+            date_start.strftime('%Y-%m-%d'), date_end.strftime('%Y-%m-%d'),
+            no_po, no_bast, date_start.year, date_start.month
+        ))
+        project_id = cursor.lastrowid
+    read_cache.invalidate()
+    return project_id
+
+def update_project(project_id, project_name, customer_name, category, pic, status,
+                   date_start, date_end, no_po, no_bast):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            UPDATE projects SET
+                project_name=?, customer_name=?, category=?, pic=?, status=?,
+                date_start=?, date_end=?, no_po=?, no_bast=?,
+                start_year=?, start_month=?
+            WHERE id=?
+        ''', (
+            project_name, customer_name, category, pic, status,
+            date_start.strftime('%Y-%m-%d'), date_end.strftime('%Y-%m-%d'),
+            no_po, no_bast, date_start.year, date_start.month, project_id
+        ))
+    read_cache.invalidate()
+
+def _queue_unreferenced_paths(cursor, file_paths):
+    # Path yang sudah tidak dipakai row project_files manapun (refcount = 0) masuk
+    # antrian file_deletions di transaksi yang sama; file di disk dihapus cleanup worker
+    orphaned = []
+    for file_path in set(file_paths):
+        cursor.execute("SELECT 1 FROM project_files WHERE file_path=? LIMIT 1", (file_path,))
+        if cursor.fetchone() is None:
+            orphaned.append(file_path)
+    cursor.executemany(
+        "INSERT OR IGNORE INTO file_deletions (file_path) VALUES (?)",
+        [(file_path,) for file_path in orphaned]
+    )
+    return orphaned
+
+def remove_project(project_id):
+    # Satu transaksi: row project dihapus (project_files ikut lewat ON DELETE CASCADE)
+    # dan file yang jadi tidak terpakai masuk antrian hapus. Return path yang diantrikan.
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT file_path FROM project_files WHERE project_id=?", (project_id,))
+        file_paths = [row[0] for row in cursor.fetchall()]
+        cursor.execute("DELETE FROM projects WHERE id=?", (project_id,))
+        orphaned = _queue_unreferenced_paths(cursor, file_paths)
+    read_cache.invalidate()
+    return orphaned
+
+# PROJECT FILES
+def add_project_file(project_id, file_name, file_path, file_category,
+                     content_hash=None, file_size=None, file_mtime=None, place_file=None):
+    # place_file (opsional, lihat storage.place_upload) menaruh file di file_path dan
+    # return mtime-nya. Dipanggil setelah INSERT di transaksi yang sama (BEGIN
+    # IMMEDIATE), jadi delete_unreferenced_file tidak bisa menghapus file itu di
+    # antara cek refcount dan row baru ini.
+    with connection() as conn:
+        if place_file is not None:
+            conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO project_files (
+                project_id, file_name, file_path, file_category,
+                content_hash, file_size, file_mtime
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (project_id, file_name, file_path, file_category, content_hash, file_size, file_mtime))
+        file_id = cursor.lastrowid
+        if place_file is not None:
+            cursor.execute("UPDATE project_files SET file_mtime=? WHERE id=?", (place_file(), file_id))
+    read_cache.invalidate()
+    return file_id
+
+def remove_project_file(file_id):
+    # Return path yang diantrikan untuk dihapus setelah row ini dihapus
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT file_path FROM project_files WHERE id=?", (file_id,))
+        file_paths = [row[0] for row in cursor.fetchall()]
+        cursor.execute("DELETE FROM project_files WHERE id=?", (file_id,))
+        orphaned = _queue_unreferenced_paths(cursor, file_paths)
+    read_cache.invalidate()
+    return orphaned
+
+# REQUIRED DOCUMENTS
+REQUIRED_DOCUMENTS = [
+    "Form Request",
+    "Form Tim Project",
+    "Form Time Schedule",
+    "SPK",
+    "BAST",
+    "Report"
+]
+# Batas aman jumlah parameter "?" per query untuk SQLite versi lama
+MAX_QUERY_PARAMS = 900
+
+@read_cache.cached
+def get_required_documents_status(project_id):
+    # Satu query GROUP BY untuk semua kategori, bukan satu query per kategori
+    placeholders = ", ".join("?" for _ in REQUIRED_DOCUMENTS)
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT file_category, COUNT(*)
+            FROM project_files
+            WHERE project_id=? AND file_category IN ({placeholders})
+            GROUP BY file_category
+        """, (project_id, *REQUIRED_DOCUMENTS))
+        uploaded = dict(cursor.fetchall())
+    return {category: uploaded.get(category, 0) > 0 for category in REQUIRED_DOCUMENTS}
+
+@read_cache.cached
+def get_documents_completeness(project_ids):
+    # {project_id: jumlah kategori required yang sudah di-upload} untuk banyak project sekaligus
+    project_ids = list(project_ids)
+    completeness = {project_id: 0 for project_id in project_ids}
+    category_placeholders = ", ".join("?" for _ in REQUIRED_DOCUMENTS)
+    chunk_size = MAX_QUERY_PARAMS - len(REQUIRED_DOCUMENTS)
+    with connection() as conn:
+        cursor = conn.cursor()
+        for i in range(0, len(project_ids), chunk_size):
+            chunk = project_ids[i:i + chunk_size]
+            id_placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+                SELECT project_id, COUNT(DISTINCT file_category)
+                FROM project_files
+                WHERE project_id IN ({id_placeholders})
+                AND file_category IN ({category_placeholders})
+                GROUP BY project_id
+            """, (*chunk, *REQUIRED_DOCUMENTS))
+            completeness.update(cursor.fetchall())
+    return completeness
+
+# DEADLINE
+@read_cache.cached
+def get_deadline_metrics(project_ids, today):
+    # {project_id: (sisa hari, overdue?, % jadwal yang sudah lewat)}, dihitung di SQL
+    # dengan julianday untuk banyak project sekaligus. today (YYYY-MM-DD) ikut jadi
+    # key cache, jadi hasilnya berganti tiap hari walaupun datanya tidak berubah.
+    project_ids = list(project_ids)
+    metrics = {}
+    chunk_size = MAX_QUERY_PARAMS - 3
+    with connection() as conn:
+        cursor = conn.cursor()
+        for i in range(0, len(project_ids), chunk_size):
+            chunk = project_ids[i:i + chunk_size]
+            id_placeholders = ", ".join("?" for _ in chunk)
+            cursor.execute(f"""
+                SELECT id,
+                       CAST(julianday(date_end) - julianday(?) AS INTEGER),
+                       status != 'Completed' AND date_end < ?,
+                       MIN(100.0, MAX(0.0, 100.0 * (julianday(?) - julianday(date_start))
+                           / MAX(1.0, julianday(date_end) - julianday(date_start))))
+                FROM projects
+                WHERE id IN ({id_placeholders})
+            """, (today, today, today, *chunk))
+            for project_id, days_left, overdue, pct_elapsed in cursor.fetchall():
+                metrics[project_id] = (days_left, bool(overdue), pct_elapsed)
+    return metrics
+
+# FILE METADATA
+def get_file_metadata():
+    # Satu row per file_path (blob bisa dipakai beberapa row), untuk reconciler
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT file_path, MAX(file_size), MAX(file_mtime), MAX(content_hash), MAX(file_missing)
+            FROM project_files
+            GROUP BY file_path
+        """)
+        return cursor.fetchall()
+
+def update_file_metadata(updates):
+    # updates: [(file_path, file_size, file_mtime, content_hash, file_missing)]
+    if not updates:
+        return
+    with connection() as conn:
+        conn.executemany("""
+            UPDATE project_files
+            SET file_size=?, file_mtime=?, content_hash=COALESCE(?, content_hash), file_missing=?
+            WHERE file_path=?
+        """, [(size, mtime, content_hash, missing, file_path)
+              for file_path, size, mtime, content_hash, missing in updates])
+    read_cache.invalidate()
+
+def get_checkpoint(name):
+    with connection() as conn:
+        row = conn.execute("SELECT value FROM maintenance_state WHERE name=?", (name,)).fetchone()
+        return row[0] if row else None
+
+def set_checkpoint(name, value):
+    with connection() as conn:
+        conn.execute("""
+            INSERT INTO maintenance_state (name, value) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET value=excluded.value
+        """, (name, value))
+
+# FILE DELETION QUEUE
+def get_due_file_deletions(now, limit):
+    with connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT file_path, attempts FROM file_deletions
+            WHERE next_attempt <= ?
+            ORDER BY next_attempt
+            LIMIT ?
+        """, (now, limit))
+        return cursor.fetchall()
+
+def get_next_file_deletion_time():
+    with connection() as conn:
+        return conn.execute("SELECT MIN(next_attempt) FROM file_deletions").fetchone()[0]
+
+def delete_unreferenced_file(file_path, remove):
+    """Panggil remove(file_path) hanya kalau tidak ada row project_files yang memakai
+    path itu, lalu keluarkan dari antrian. Cek dan hapus terjadi di bawah write lock
+    (BEGIN IMMEDIATE), sama dengan add_project_file(place_file=...), jadi upload isi
+    yang sama tidak bisa menyelip di antaranya. Return False kalau path dipakai lagi.
+    Kalau remove raise, transaksi di-rollback dan antriannya tetap ada."""
+    with connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM project_files WHERE file_path=? LIMIT 1", (file_path,))
+        referenced = cursor.fetchone() is not None
+        if not referenced:
+            remove(file_path)
+        cursor.execute("DELETE FROM file_deletions WHERE file_path=?", (file_path,))
+    return not referenced
+
+def finish_file_deletion(file_path):
+    with connection() as conn:
+        conn.execute("DELETE FROM file_deletions WHERE file_path=?", (file_path,))
+
+def retry_file_deletion(file_path, next_attempt, error):
+    with connection() as conn:
+        conn.execute("""
+            UPDATE file_deletions
+            SET attempts = attempts + 1, next_attempt = ?, last_error = ?
+            WHERE file_path=?
+        """, (next_attempt, error, file_path))
@@ -0,0 +1,219 @@
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import threading
+
+import db
+from cleanup import remove_file
+from storage import BLOB_ROOT, EXPORT_ROOT, file_checksum
+from previews import RENDITION_ROOT, rendition_key
+
+# FILE INTEGRITY
+# project_files menyimpan ukuran, mtime, checksum dan flag missing setiap file.
+# UI hanya membaca kolom-kolom itu; job maintenance di bawah yang mencocokkannya
+# dengan filesystem:
+# - reconcile_files(): row -> file (missing / berubah), tiap RECONCILE_INTERVAL
+# - scan_files(): file -> row (orphan, checksum blob), tiap SCAN_INTERVAL secara
+#   incremental dan tiap FULL_SCAN_INTERVAL penuh
+# Bisa dijalankan dari CLI (python integrity.py --help) atau thread di app.
+
+FILES_ROOT = "files"
+RECONCILE_INTERVAL = 300
+SCAN_INTERVAL = 60 * 60
+FULL_SCAN_INTERVAL = 24 * 60 * 60
+# File tanpa row yang lebih muda dari ini dibiarkan: bisa jadi upload yang
+# row project_files-nya belum sempat di-insert
+ORPHAN_GRACE = 60 * 60
+# Job maintenance di dalam proses app hanya melapor (log). Menghapus file orphan
+# dan rendition basi dilakukan lewat `python integrity.py --reap`, kecuali ini
+# sengaja di-set True.
+REAP_IN_APP = False
+# Punya siklus hidup sendiri (storage._prune_exports / reap renditions di bawah)
+SKIP_DIRS = {os.path.normpath(EXPORT_ROOT), os.path.normpath(RENDITION_ROOT)}
+
+logger = logging.getLogger(__name__)
+
+_maintenance = None
+_maintenance_lock = threading.Lock()
+
+
+def reconcile_files():
+    """Stat setiap file_path sekali. Return {"missing": [...], "changed": [...]}
+    berisi path yang baru hilang / isinya berubah sejak dicatat."""
+    missing, changed, updates = [], [], []
+    for file_path, size, mtime, content_hash, was_missing in db.get_file_metadata():
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            if not was_missing:
+                missing.append(file_path)
+                updates.append((file_path, size, mtime, None, 1))
+            continue
+        if not was_missing and stat.st_size == size and stat.st_mtime == mtime:
+            continue
+        if content_hash is None:
+            # Belum pernah dicatat: checksum pertama jadi acuan
+            content_hash = file_checksum(file_path)
+        elif size is not None and file_checksum(file_path) != content_hash:
+            # content_hash tetap checksum saat upload (tidak ditimpa), jadi scan_files
+            # juga terus melaporkan file ini sebagai corrupt
+            changed.append(file_path)
+        updates.append((file_path, stat.st_size, stat.st_mtime, content_hash, 0))
+    db.update_file_metadata(updates)
+    return {"missing": missing, "changed": changed}
+
+def _walk_files(since):
+    # Yield (path, stat). Direktori yang mtime-nya tidak berubah sejak checkpoint
+    # tidak punya file baru/terhapus, jadi isinya tidak di-stat satu per satu
+    for dirpath, dirnames, filenames in os.walk(FILES_ROOT):
+        dirnames[:] = [
+            name for name in dirnames
+            if os.path.normpath(os.path.join(dirpath, name)) not in SKIP_DIRS
+        ]
+        if since is not None and os.stat(dirpath).st_mtime < since:
+            continue
+        for name in filenames:
+            file_path = os.path.join(dirpath, name)
+            try:
+                yield file_path, os.stat(file_path)
+            except FileNotFoundError:
+                continue
+
+def _blob_checksum_name(file_path):
+    # Nama blob = sha256 isinya (storage.blob_path); file lain tidak punya nama hash
+    if os.path.normpath(os.path.dirname(os.path.dirname(file_path))) != os.path.normpath(BLOB_ROOT):
+        return None
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+def _reap_renditions(referenced, reap):
+    # Rendition untuk file yang sudah tidak ada / sudah berubah isinya
+    if not os.path.isdir(RENDITION_ROOT):
+        return []
+    valid_keys = set()
+    for file_path in referenced:
+        try:
+            valid_keys.add(rendition_key(file_path))
+        except FileNotFoundError:
+            continue
+    stale = [
+        os.path.join(RENDITION_ROOT, key)
+        for key in os.listdir(RENDITION_ROOT)
+        if key not in valid_keys
+    ]
+    if reap:
+        for rendition_dir in stale:
+            shutil.rmtree(rendition_dir, ignore_errors=True)
+    return stale
+
+def scan_files(full=False, reap=False):
+    """Cocokkan isi files/ dengan project_files.
+    Return {"orphans", "reaped", "corrupt", "stale_renditions"}; file orphan dan
+    rendition basi hanya dihapus kalau reap=True."""
+    started = time.time()
+    checkpoint = "full_scan" if full else "incremental_scan"
+    since = None if full else db.get_checkpoint("incremental_scan")
+    metadata = {
+        os.path.normpath(file_path): content_hash
+        for file_path, _, _, content_hash, _ in db.get_file_metadata()
+    }
+    report = {"orphans": [], "reaped": [], "corrupt": [], "stale_renditions": []}
+    for file_path, stat in _walk_files(since):
+        normalized = os.path.normpath(file_path)
+        if normalized not in metadata:
+            if started - stat.st_mtime < ORPHAN_GRACE:
+                continue
+            report["orphans"].append(file_path)
+            if reap:
+                try:
+                    # Cek ulang refcount di bawah write lock: upload bisa saja baru memakai path ini
+                    if db.delete_unreferenced_file(file_path, remove_file):
+                        report["reaped"].append(file_path)
+                except OSError as e:
+                    logger.warning("Gagal hapus orphan %s: %s", file_path, e)
+            continue
+        if since is not None and stat.st_mtime < since:
+            continue
+        expected = _blob_checksum_name(file_path) or metadata[normalized]
+        try:
+            if expected and file_checksum(file_path) != expected:
+                report["corrupt"].append(file_path)
+        except FileNotFoundError:
+            # Dihapus cleanup worker selagi scan berjalan
+            continue
+    if full:
+        report["stale_renditions"] = _reap_renditions(metadata, reap)
+    db.set_checkpoint(checkpoint, started)
+    if full:
+        db.set_checkpoint("incremental_scan", started)
+    return report
+
+def run_maintenance(reap=False):
+    # Dipanggil berkala; scan hanya jalan kalau checkpoint-nya sudah lewat interval,
+    # jadi beberapa proses app tidak men-scan berulang-ulang
+    reconciled = reconcile_files()
+    now = time.time()
+    last_full = db.get_checkpoint("full_scan")
+    last_scan = db.get_checkpoint("incremental_scan")
+    report = None
+    if last_full is None or now - last_full >= FULL_SCAN_INTERVAL:
+        report = scan_files(full=True, reap=reap)
+    elif last_scan is None or now - last_scan >= SCAN_INTERVAL:
+        report = scan_files(full=False, reap=reap)
+    for file_path in reconciled["missing"]:
+        logger.warning("File hilang: %s", file_path)
+    for file_path in reconciled["changed"]:
+        logger.warning("Isi file berubah sejak upload: %s", file_path)
+    if report:
+        for file_path in report["corrupt"]:
+            logger.warning("Checksum tidak cocok: %s", file_path)
+        for file_path in report["orphans"]:
+            logger.info("File orphan%s: %s", " (dihapus)" if file_path in report["reaped"] else "", file_path)
+    return reconciled, report
+
+def _maintenance_loop(interval, reap):
+    while True:
+        try:
+            run_maintenance(reap=reap)
+        except Exception:
+            logger.exception("File maintenance gagal")
+        time.sleep(interval)
+
+def start_maintenance(interval=RECONCILE_INTERVAL, reap=False):
+    # Aman dipanggil di setiap rerun: thread hanya dibuat sekali per proses
+    global _maintenance
+    with _maintenance_lock:
+        if _maintenance is None or not _maintenance.is_alive():
+            _maintenance = threading.Thread(
+                target=_maintenance_loop, args=(interval, reap),
+                name="file-maintenance", daemon=True
+            )
+            _maintenance.start()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cek integritas files/ terhadap project_files")
+    parser.add_argument("--full", action="store_true", help="scan semua direktori, abaikan checkpoint")
+    parser.add_argument("--reap", action="store_true", help="hapus file orphan dan rendition basi")
+    args = parser.parse_args(argv)
+    db.init_db()
+    reconciled = reconcile_files()
+    report = scan_files(full=args.full, reap=args.reap)
+    for label, paths in [
+        ("Missing", reconciled["missing"]),
+        ("Changed", reconciled["changed"]),
+        ("Corrupt", report["corrupt"]),
+        ("Orphan", report["orphans"]),
+        ("Stale rendition", report["stale_renditions"]),
+    ]:
+        for path in paths:
+            print(f"{label}: {path}")
+    print(
+        f"{len(report['orphans'])} orphan ({len(report['reaped'])} dihapus), "
+        f"{len(report['corrupt'])} corrupt, {len(reconciled['missing'])} missing"
+    )
+    return 1 if report["corrupt"] or reconciled["missing"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+# SCHEMA MIGRATIONS
+# Versi schema disimpan di PRAGMA user_version. Setiap migration dijalankan
+# sekali, berurutan, dalam satu transaksi bersama update versinya.
+
+def _create_base_tables(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_name TEXT NOT NULL,
+            customer_name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            pic TEXT NOT NULL,
+            status TEXT NOT NULL,
+            date_start TEXT NOT NULL,
+            date_end TEXT NOT NULL,
+            no_po TEXT,
+            no_bast TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_files (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            file_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_category TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES projects (id)
+        )
+    ''')
+
+def _add_lookup_indexes(cursor):
+    # Covering index untuk cek dokumen per project dan filter board/timeline
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_project_files_project_category
+        ON project_files (project_id, file_category)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_status_start
+        ON projects (status, date_start)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_category_start
+        ON projects (category, date_start)
+    ''')
+
+def _add_start_year_month(cursor):
+    # Kolom tahun/bulan mulai yang bisa di-index, pengganti strftime('%Y', date_start)
+    cursor.execute("ALTER TABLE projects ADD COLUMN start_year INTEGER")
+    cursor.execute("ALTER TABLE projects ADD COLUMN start_month INTEGER")
+    cursor.execute('''
+        UPDATE projects SET
+            start_year = CAST(substr(date_start, 1, 4) AS INTEGER),
+            start_month = CAST(substr(date_start, 6, 2) AS INTEGER)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_start_year_month
+        ON projects (start_year, start_month, date_start)
+    ''')
+
+def _create_project_files_fts_triggers(cursor):
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS project_files_fts_insert AFTER INSERT ON project_files BEGIN
+            INSERT INTO project_files_fts (rowid, file_name, file_category)
+            VALUES (new.id, new.file_name, new.file_category);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS project_files_fts_delete AFTER DELETE ON project_files BEGIN
+            INSERT INTO project_files_fts (project_files_fts, rowid, file_name, file_category)
+            VALUES ('delete', old.id, old.file_name, old.file_category);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS project_files_fts_update AFTER UPDATE ON project_files BEGIN
+            INSERT INTO project_files_fts (project_files_fts, rowid, file_name, file_category)
+            VALUES ('delete', old.id, old.file_name, old.file_category);
+            INSERT INTO project_files_fts (rowid, file_name, file_category)
+            VALUES (new.id, new.file_name, new.file_category);
+        END
+    ''')
+
+def _add_search_index(cursor):
+    # Full-text index (FTS5, external content) untuk search board & file preview.
+    # Trigger menjaga index tetap sama dengan tabel aslinya.
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+            project_name, customer_name, pic, no_po, no_bast,
+            content='projects', content_rowid='id', prefix='2 3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO projects_fts (rowid, project_name, customer_name, pic, no_po, no_bast)
+            VALUES (new.id, new.project_name, new.customer_name, new.pic, new.no_po, new.no_bast);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, project_name, customer_name, pic, no_po, no_bast)
+            VALUES ('delete', old.id, old.project_name, old.customer_name, old.pic, old.no_po, old.no_bast);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE ON projects BEGIN
+            INSERT INTO projects_fts (projects_fts, rowid, project_name, customer_name, pic, no_po, no_bast)
+            VALUES ('delete', old.id, old.project_name, old.customer_name, old.pic, old.no_po, old.no_bast);
+            INSERT INTO projects_fts (rowid, project_name, customer_name, pic, no_po, no_bast)
+            VALUES (new.id, new.project_name, new.customer_name, new.pic, new.no_po, new.no_bast);
+        END
+    ''')
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS project_files_fts USING fts5(
+            file_name, file_category,
+            content='project_files', content_rowid='id', prefix='2 3'
+        )
+    ''')
+    _create_project_files_fts_triggers(cursor)
+    cursor.execute("INSERT INTO projects_fts (projects_fts) VALUES ('rebuild')")
+    cursor.execute("INSERT INTO project_files_fts (project_files_fts) VALUES ('rebuild')")
+
+def _add_board_index(cursor):
+    # Hitung per (category, status) dan ambil halaman kolom board tanpa sort ulang
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_board
+        ON projects (start_year, category, status, date_start)
+    ''')
+
+def _add_content_hash(cursor):
+    # Blob store content-addressed: referensi dihitung dari row per file_path
+    cursor.execute("ALTER TABLE project_files ADD COLUMN content_hash TEXT")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_project_files_path
+        ON project_files (file_path)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_project_files_hash
+        ON project_files (content_hash)
+    ''')
+
+def _add_file_metadata(cursor):
+    # Ukuran/mtime dicatat saat upload dan dijaga oleh integrity.reconcile_files,
+    # jadi list file tidak perlu stat ke filesystem di setiap render
+    cursor.execute("ALTER TABLE project_files ADD COLUMN file_size INTEGER")
+    cursor.execute("ALTER TABLE project_files ADD COLUMN file_mtime REAL")
+    cursor.execute("ALTER TABLE project_files ADD COLUMN file_missing INTEGER NOT NULL DEFAULT 0")
+
+def _add_maintenance_state(cursor):
+    # Checkpoint job maintenance (integrity.scan_files), dibagi antar proses
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS maintenance_state (
+            name TEXT PRIMARY KEY,
+            value REAL NOT NULL
+        )
+    ''')
+
+def _cascade_project_files(cursor):
+    # SQLite tidak bisa ALTER foreign key: tabel dibuat ulang dengan ON DELETE
+    # CASCADE (id tetap sama, jadi index FTS tetap valid), lalu index & trigger
+    # dipasang lagi. Row yang project-nya sudah tidak ada tidak ikut dipindah.
+    cursor.execute('''
+        CREATE TABLE project_files_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            file_name TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            file_category TEXT NOT NULL,
+            content_hash TEXT,
+            file_size INTEGER,
+            file_mtime REAL,
+            file_missing INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO project_files_new (
+            id, project_id, file_name, file_path, file_category,
+            content_hash, file_size, file_mtime, file_missing
+        )
+        SELECT id, project_id, file_name, file_path, file_category,
+               content_hash, file_size, file_mtime, file_missing
+        FROM project_files
+        WHERE project_id IN (SELECT id FROM projects)
+    ''')
+    cursor.execute("DROP TABLE project_files")
+    cursor.execute("ALTER TABLE project_files_new RENAME TO project_files")
+    _add_lookup_indexes(cursor)
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_project_files_path
+        ON project_files (file_path)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_project_files_hash
+        ON project_files (content_hash)
+    ''')
+    _create_project_files_fts_triggers(cursor)
+    cursor.execute("INSERT INTO project_files_fts (project_files_fts) VALUES ('rebuild')")
+    # Antrian hapus file dari disk, diisi di transaksi yang sama dengan delete row
+    # dan dikerjakan cleanup worker di background (lihat cleanup.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS file_deletions (
+            file_path TEXT PRIMARY KEY,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL DEFAULT 0,
+            last_error TEXT
+        )
+    ''')
+
+def _add_status_history(cursor):
+    # Riwayat perubahan status untuk analytics (cycle time, WIP, on-time).
+    # Ditulis oleh trigger, jadi semua jalur insert/update ikut tercatat.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            changed_at TEXT NOT NULL,
+            backfilled INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES projects (id) ON DELETE CASCADE
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_status_history_project
+        ON project_status_history (project_id, changed_at)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS projects_status_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO project_status_history (project_id, status, changed_at)
+            VALUES (new.id, new.status, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS projects_status_update AFTER UPDATE OF status ON projects
+        WHEN old.status IS NOT new.status BEGIN
+            INSERT INTO project_status_history (project_id, status, changed_at)
+            VALUES (new.id, new.status, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'));
+        END
+    ''')
+    # Project lama: waktu perubahan aslinya tidak diketahui, dicatat mulai date_start
+    # (maksimal sekarang, supaya tidak jatuh setelah perubahan status berikutnya)
+    # dan ditandai backfilled supaya tidak dipakai untuk durasi/tanggal selesai
+    cursor.execute('''
+        INSERT INTO project_status_history (project_id, status, changed_at, backfilled)
+        SELECT id, status,
+               MIN(date_start || ' 00:00:00', strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')), 1
+        FROM projects
+    ''')
+
+def _add_interval_index(cursor):
+    # R*Tree atas (date_start, date_end) dalam hari sejak 1970-01-01, untuk query
+    # "project yang aktif di rentang tanggal" (timeline Gantt) tanpa scan tabel.
+    # MIN/MAX karena R*Tree menolak interval terbalik.
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS projects_interval USING rtree_i32(
+            id, start_day, end_day
+        )
+    ''')
+    day = "CAST(julianday({}) - 2440587.5 AS INTEGER)"
+    start_day = day.format("MIN(new.date_start, new.date_end)")
+    end_day = day.format("MAX(new.date_start, new.date_end)")
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS projects_interval_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO projects_interval (id, start_day, end_day)
+            VALUES (new.id, {start_day}, {end_day});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS projects_interval_update AFTER UPDATE OF date_start, date_end ON projects BEGIN
+            UPDATE projects_interval SET start_day = {start_day}, end_day = {end_day}
+            WHERE id = new.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS projects_interval_delete AFTER DELETE ON projects BEGIN
+            DELETE FROM projects_interval WHERE id = old.id;
+        END
+    ''')
+    cursor.execute(f'''
+        INSERT INTO projects_interval (id, start_day, end_day)
+        SELECT id, {start_day.replace("new.", "")}, {end_day.replace("new.", "")} FROM projects
+    ''')
+
+def _add_board_deadline_index(cursor):
+    # Urutan kartu board berdasarkan deadline terdekat tanpa sort ulang
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_projects_board_deadline
+        ON projects (start_year, category, status, date_end)
+    ''')
+
+def _backfill_status_on_create(cursor):
+    # Project yang dibuat langsung dengan status selain Not Started (mis. mencatat
+    # pekerjaan lama sebagai Completed) tidak benar-benar masuk status itu saat
+    # dibuat. Row pertamanya diperlakukan seperti backfill: mulai date_start
+    # (maksimal sekarang) dan backfilled=1, supaya tidak dihitung sebagai tanggal
+    # selesai atau durasi status.
+    cursor.execute("DROP TRIGGER IF EXISTS projects_status_insert")
+    cursor.execute('''
+        CREATE TRIGGER projects_status_insert AFTER INSERT ON projects BEGIN
+            INSERT INTO project_status_history (project_id, status, changed_at, backfilled)
+            SELECT new.id, new.status, strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'), 0
+            WHERE new.status = 'Not Started'
+            UNION ALL
+            SELECT new.id, new.status,
+                   MIN(new.date_start || ' 00:00:00', strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime')), 1
+            WHERE new.status IS NOT 'Not Started';
+        END
+    ''')
+    cursor.execute('''
+        UPDATE project_status_history
+        SET backfilled = 1,
+            changed_at = MIN(
+                (SELECT date_start FROM projects WHERE projects.id = project_status_history.project_id) || ' 00:00:00',
+                changed_at
+            )
+        WHERE backfilled = 0
+          AND status IS NOT 'Not Started'
+          AND id IN (SELECT MIN(id) FROM project_status_history GROUP BY project_id)
+    ''')
+
+def _clamp_backfilled_status_history(cursor):
+    # Backfill versi awal migrasi 10 memakai date_start apa adanya; project yang
+    # mulai di masa depan mendapat row yang tercatat setelah perubahan status
+    # sungguhan. Row seperti itu dimajukan ke sebelum perubahan pertama project
+    # tersebut (atau sekarang kalau belum ada perubahan).
+    cursor.execute('''
+        UPDATE project_status_history
+        SET changed_at = MIN(
+            changed_at,
+            strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'),
+            COALESCE((
+                SELECT MIN(later.changed_at) FROM project_status_history AS later
+                WHERE later.project_id = project_status_history.project_id
+                  AND later.id > project_status_history.id
+            ), changed_at)
+        )
+        WHERE backfilled = 1
+    ''')
+
+MIGRATIONS = [
+    (1, _create_base_tables),
+    (2, _add_lookup_indexes),
+    (3, _add_start_year_month),
+    (4, _add_search_index),
+    (5, _add_board_index),
+    (6, _add_content_hash),
+    (7, _add_file_metadata),
+    (8, _add_maintenance_state),
+    (9, _cascade_project_files),
+    (10, _add_status_history),
+    (11, _add_interval_index),
+    (12, _add_board_deadline_index),
+    (13, _backfill_status_on_create),
+    (14, _clamp_backfilled_status_history),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    if conn.in_transaction:
+        conn.commit()
+    for version, apply in MIGRATIONS:
+        if get_schema_version(conn) >= version:
+            continue
+        # BEGIN IMMEDIATE supaya proses lain menunggu, lalu cek ulang versinya
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) < version:
+                apply(conn.cursor())
+                conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return get_schema_version(conn)
@@ -0,0 +1,190 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import pandas as pd
+
+from storage import BLOB_ROOT
+
+# Dependency opsional: kalau tidak ter-install, preview pakai file aslinya (hanya
+# kalau file-nya kecil, lihat MAX_ORIGINAL_PREVIEW_SIZE)
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = PdfWriter = None
+
+# PREVIEW RENDITIONS
+# Preview dibuat sekali per isi file di background lalu disimpan di
+# files/renditions/<key>/: thumbnail gambar, beberapa halaman pertama PDF, dan
+# potongan awal tiap sheet spreadsheet (CSV). Tab File Preview hanya membaca hasil
+# kecil ini, jadi ukurannya tidak tergantung ukuran file aslinya. Rendition
+# dijadwalkan saat upload (prepare_previews) dan script thread tidak pernah
+# menunggu render: yang belum siap dilaporkan "pending".
+
+RENDITION_ROOT = os.path.join("files", "renditions")
+THUMBNAIL_SIZE = (1024, 1024)
+PDF_PREVIEW_PAGES = 3
+SHEET_PREVIEW_ROWS = 200
+RENDITION_WAIT = 0
+# Tanpa rendition (dependency tidak ada / render gagal), file asli hanya dipakai
+# untuk preview sampai ukuran ini; di atasnya status "no_preview"
+MAX_ORIGINAL_PREVIEW_SIZE = 2 * 1024 * 1024
+SPREADSHEET_EXTENSIONS = {'.xls', '.xlsx'}
+# Render yang gagal langsung memakai fallback selama FAILED_RETRY_AFTER detik,
+# setelah itu dicoba lagi (kegagalan bisa sementara, mis. file sedang dikunci).
+# Paling banyak MAX_FAILED_RENDERS yang diingat; yang paling lama dibuang dulu.
+FAILED_RETRY_AFTER = 10 * 60
+MAX_FAILED_RENDERS = 256
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rendition")
+_pending = {}
+_failed = OrderedDict()
+_pending_lock = threading.RLock()
+
+
+def rendition_key(file_path):
+    # Blob sudah diberi nama sesuai sha256 isinya; file lama pakai path + mtime + ukuran
+    if os.path.abspath(file_path).startswith(os.path.abspath(BLOB_ROOT) + os.sep):
+        return os.path.splitext(os.path.basename(file_path))[0]
+    stat = os.stat(file_path)
+    return hashlib.sha256(f"{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}".encode()).hexdigest()
+
+def _write_atomic(dst, write):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dst), suffix=".part")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _render_image(src, dst):
+    def write(tmp_path):
+        with Image.open(src) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            image.convert("RGB").save(tmp_path, format="JPEG", quality=85)
+    _write_atomic(dst, write)
+
+def _render_pdf(src, dst):
+    def write(tmp_path):
+        reader = PdfReader(src)
+        writer = PdfWriter()
+        for page in reader.pages[:PDF_PREVIEW_PAGES]:
+            writer.add_page(page)
+        with open(tmp_path, "wb") as f:
+            writer.write(f)
+    _write_atomic(dst, write)
+
+def _render_sheet(src, dst, sheet_index):
+    def write(tmp_path):
+        # Reader openpyxl pandas berhenti setelah nrows baris, sisa sheet tidak dibaca
+        df = pd.read_excel(src, sheet_name=sheet_index, nrows=SHEET_PREVIEW_ROWS)
+        df.to_csv(tmp_path, index=False)
+    _write_atomic(dst, write)
+
+# extension -> (nama file rendition, renderer, dependency tersedia?)
+RENDERERS = {
+    '.jpg': ("thumbnail.jpg", _render_image, Image is not None),
+    '.jpeg': ("thumbnail.jpg", _render_image, Image is not None),
+    '.png': ("thumbnail.jpg", _render_image, Image is not None),
+    '.pdf': ("preview.pdf", _render_pdf, PdfReader is not None),
+}
+
+def _original_fallback(file_path):
+    try:
+        if os.path.getsize(file_path) <= MAX_ORIGINAL_PREVIEW_SIZE:
+            return "unavailable", file_path
+    except OSError:
+        pass
+    return "no_preview", None
+
+def _cached_rendition(dst, render, file_path, *args, wait=RENDITION_WAIT):
+    if os.path.exists(dst):
+        return "ready", dst
+    with _pending_lock:
+        failed_at = _failed.get(dst)
+        if failed_at is not None:
+            if time.monotonic() - failed_at < FAILED_RETRY_AFTER:
+                return _original_fallback(file_path)
+            del _failed[dst]
+        future = _pending.get(dst)
+        if future is None:
+            future = _executor.submit(render, file_path, dst, *args)
+            _pending[dst] = future
+            future.add_done_callback(lambda done: _pop_pending(dst, done))
+    try:
+        future.result(timeout=wait)
+    except TimeoutError:
+        return "pending", None
+    except Exception:
+        return _original_fallback(file_path)
+    return "ready", dst
+
+def get_rendition(file_path, wait=RENDITION_WAIT):
+    """Return (status, path). status "ready": path rendition siap dipakai;
+    "pending": masih dibuat di background; "unavailable": pakai file aslinya
+    (kecil); "no_preview": tidak ada preview, path None."""
+    extension = os.path.splitext(file_path)[1].lower()
+    renderer = RENDERERS.get(extension)
+    if renderer is None or not renderer[2] or not os.path.exists(file_path):
+        return _original_fallback(file_path)
+    rendition_name, render, _ = renderer
+    dst = os.path.join(RENDITION_ROOT, rendition_key(file_path), rendition_name)
+    return _cached_rendition(dst, render, file_path, wait=wait)
+
+# SPREADSHEET PREVIEW
+def _render_sheet_list(src, dst):
+    # Hanya nama sheet: isi sheet tidak di-parse
+    with pd.ExcelFile(src) as workbook:
+        sheet_names = [str(name) for name in workbook.sheet_names]
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(sheet_names, f)
+    _write_atomic(dst, write)
+
+def list_sheets(file_path, wait=RENDITION_WAIT):
+    """Return (status, nama sheet). status seperti get_rendition; nama sheet None
+    kalau belum siap / gagal dibaca."""
+    dst = os.path.join(RENDITION_ROOT, rendition_key(file_path), "sheets.json")
+    status, path = _cached_rendition(dst, _render_sheet_list, file_path, wait=wait)
+    if status != "ready":
+        return status, None
+    with open(path, "r") as f:
+        return status, json.load(f)
+
+def get_sheet_preview(file_path, sheet_index, wait=RENDITION_WAIT):
+    """Seperti get_rendition, tapi untuk SHEET_PREVIEW_ROWS baris pertama satu sheet."""
+    dst = os.path.join(RENDITION_ROOT, rendition_key(file_path), f"sheet_{sheet_index}.csv")
+    return _cached_rendition(dst, _render_sheet, file_path, sheet_index, wait=wait)
+
+def prepare_previews(file_path):
+    # Dipanggil setelah upload: jadwalkan rendition di background tanpa menunggu,
+    # supaya saat Preview diklik hasilnya biasanya sudah ada
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in RENDERERS:
+        get_rendition(file_path, wait=0)
+    elif extension in SPREADSHEET_EXTENSIONS:
+        list_sheets(file_path, wait=0)
+        get_sheet_preview(file_path, 0, wait=0)
+
+def _pop_pending(dst, future):
+    with _pending_lock:
+        _pending.pop(dst, None)
+        if future.exception() is not None:
+            # Supaya rerun berikutnya tidak menjadwalkan ulang render yang sama terus-menerus
+            _failed[dst] = time.monotonic()
+            _failed.move_to_end(dst)
+            if len(_failed) > MAX_FAILED_RENDERS:
+                _failed.popitem(last=False)
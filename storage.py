@@ -0,0 +1,161 @@
+import os
+import hashlib
+import tempfile
+import zipfile
+
+# FILE STORAGE
+# Upload ditulis per chunk ke file sementara, ukuran dicek dan checksum dihitung
+# sambil jalan, lalu di-rename atomik ke blob store. Jadi tidak ada salinan penuh
+# file di memory, dan upload yang gagal/kebesaran tidak meninggalkan file setengah jadi.
+#
+# Blob store bersifat content-addressed: files/blobs/<2 char hash>/<sha256><ext>.
+# Isi yang sama hanya disimpan sekali; jumlah referensinya adalah jumlah row
+# project_files dengan file_path blob tersebut; blob tanpa referensi dihapus
+# oleh cleanup worker (lihat db.remove_project_file dan cleanup.py).
+
+CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+BLOB_ROOT = os.path.join("files", "blobs")
+EXPORT_ROOT = os.path.join("files", "exports")
+MAX_CACHED_EXPORTS = 20
+# Format yang isinya sudah terkompres: disimpan apa adanya (ZIP_STORED), tidak di-deflate ulang
+STORED_EXTENSIONS = {'.pdf', '.jpg', '.jpeg', '.png', '.docx', '.xlsx', '.pptx', '.zip'}
+
+
+class UploadTooLarge(ValueError):
+    pass
+
+
+def blob_path(checksum, file_name):
+    extension = os.path.splitext(file_name)[1].lower()
+    return os.path.join(BLOB_ROOT, checksum[:2], checksum + extension)
+
+def save_upload(uploaded_file, file_name, max_size=MAX_UPLOAD_SIZE):
+    # Return (tmp_path, path blob, ukuran, sha256). File baru dipindah ke blob store
+    # oleh place_upload() di dalam transaksi insert project_files (lihat
+    # db.add_project_file), supaya cleanup worker tidak bisa menghapus blob yang sama
+    # di antara cek "blob sudah ada" dan insert row-nya.
+    tmp_dir = os.path.join(BLOB_ROOT, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, prefix=".upload-", suffix=".part")
+    checksum = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            uploaded_file.seek(0)
+            while True:
+                chunk = uploaded_file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_size is not None and size > max_size:
+                    raise UploadTooLarge(f"File size exceeds {max_size // (1024 * 1024)}MB limit")
+                checksum.update(chunk)
+                out.write(chunk)
+            out.flush()
+            os.fsync(out.fileno())
+    except BaseException:
+        discard_upload(tmp_path)
+        raise
+    digest = checksum.hexdigest()
+    return tmp_path, blob_path(digest, file_name), size, digest
+
+def place_upload(tmp_path, file_path):
+    # Return mtime blob. Harus dipanggil saat memegang write lock database.
+    if os.path.exists(file_path):
+        # Isi yang sama sudah ada, cukup pakai blob yang lama
+        os.remove(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.replace(tmp_path, file_path)
+    return os.stat(file_path).st_mtime
+
+def discard_upload(tmp_path):
+    # Upload yang gagal / tidak jadi di-insert tidak meninggalkan file sementara
+    try:
+        os.remove(tmp_path)
+    except FileNotFoundError:
+        pass
+
+def file_checksum(file_path):
+    checksum = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+# ZIP EXPORT
+def _export_key(files):
+    # Key berubah kalau daftar file, isi (mtime/ukuran) atau nama di arsip berubah
+    key = hashlib.sha256()
+    for file_name, file_path in sorted(files):
+        if os.path.exists(file_path):
+            stat = os.stat(file_path)
+            key.update(f"{file_name}\0{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+        else:
+            key.update(f"{file_name}\0{file_path}\0missing\n".encode())
+    return key.hexdigest()
+
+def _prune_exports():
+    # Bisa jalan bersamaan dari beberapa session: file yang sudah dihapus session
+    # lain dilewati. Arsip yang sedang dibaca tetap aman karena sudah dibuka
+    # (lihat build_zip_archive).
+    exports = []
+    for name in os.listdir(EXPORT_ROOT):
+        if not name.endswith(".zip"):
+            continue
+        export_path = os.path.join(EXPORT_ROOT, name)
+        try:
+            exports.append((os.path.getmtime(export_path), export_path))
+        except FileNotFoundError:
+            continue
+    exports.sort(reverse=True)
+    for _, old_export in exports[MAX_CACHED_EXPORTS:]:
+        try:
+            os.remove(old_export)
+        except OSError:
+            continue
+
+def build_zip_archive(files):
+    # files: [(file_name, file_path)]. Return (file zip yang sudah dibuka "rb",
+    # [nama file yang hilang]); caller yang menutupnya. Arsip ditulis langsung ke
+    # disk (bukan BytesIO) dan dipakai ulang selama file-filenya tidak berubah.
+    # Dibuka sebelum return supaya _prune_exports dari session lain tidak bisa
+    # menghapusnya sebelum sempat dibaca.
+    os.makedirs(EXPORT_ROOT, exist_ok=True)
+    missing = [file_name for file_name, file_path in files if not os.path.exists(file_path)]
+    zip_path = os.path.join(EXPORT_ROOT, _export_key(files) + ".zip")
+    try:
+        zip_file = open(zip_path, "rb")
+    except FileNotFoundError:
+        pass
+    else:
+        try:
+            os.utime(zip_path)
+        except FileNotFoundError:
+            pass
+        return zip_file, missing
+    fd, tmp_path = tempfile.mkstemp(dir=EXPORT_ROOT, prefix=".export-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out, zipfile.ZipFile(out, "w") as zipf:
+            used_names = set()
+            for file_name, file_path in files:
+                if not os.path.exists(file_path):
+                    continue
+                base, extension = os.path.splitext(file_name)
+                arcname = file_name
+                counter = 1
+                while arcname in used_names:
+                    arcname = f"{base} ({counter}){extension}"
+                    counter += 1
+                used_names.add(arcname)
+                compress_type = zipfile.ZIP_STORED if extension.lower() in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+                zipf.write(file_path, arcname=arcname, compress_type=compress_type)
+        zip_file = open(tmp_path, "rb")
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _prune_exports()
+    return zip_file, missing
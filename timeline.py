@@ -0,0 +1,79 @@
+import calendar
+from datetime import date, timedelta
+
+import pandas as pd
+import plotly.express as px
+
+from db import get_projects_active_between, get_deadline_metrics
+
+# TIMELINE (GANTT)
+# Semua project yang aktif di bulan terpilih (bukan hanya yang mulai di bulan itu)
+# diambil dengan satu query interval lalu digambar sebagai satu figure Plotly.
+
+STATUS_COLORS = {
+    "Not Started": "gray",
+    "On Going": "blue",
+    "Completed": "green",
+    "Waiting BA": "orange",
+}
+ROW_HEIGHT = 28
+DONE_STATUS = "Completed"
+# Sisa hari di bawah ini ditandai mendesak
+URGENT_DAYS = 7
+
+
+def month_bounds(year, month):
+    last_day = calendar.monthrange(int(year), int(month))[1]
+    return date(int(year), int(month), 1), date(int(year), int(month), last_day)
+
+def get_active_projects(year, month):
+    month_start, month_end = month_bounds(year, month)
+    return get_projects_active_between(month_start.isoformat(), month_end.isoformat())
+
+def get_deadlines(projects):
+    return get_deadline_metrics(tuple(project[0] for project in projects), date.today().isoformat())
+
+def sort_by_urgency(projects, deadlines, status_index):
+    # Overdue paling lama dulu, lalu sisa hari terkecil; yang sudah Completed di akhir
+    return sorted(
+        projects,
+        key=lambda project: (project[status_index] == DONE_STATUS, deadlines[project[0]][0])
+    )
+
+def deadline_label(metrics, status):
+    days_left, overdue, pct_elapsed = metrics
+    if status == DONE_STATUS:
+        return "✅ Selesai"
+    if overdue:
+        return f"🔴 Overdue {-days_left} hari"
+    icon = "🟠" if days_left <= URGENT_DAYS else "🟢"
+    return f"{icon} {days_left} hari lagi · {pct_elapsed:.0f}% jadwal terpakai"
+
+def build_gantt(projects, year, month, deadlines):
+    month_start, month_end = month_bounds(year, month)
+    df = pd.DataFrame(projects, columns=[
+        "id", "project_name", "customer_name", "category", "pic",
+        "status", "date_start", "date_end"
+    ])
+    df["deadline"] = [
+        deadline_label(deadlines[project_id], status)
+        for project_id, status in zip(df["id"], df["status"])
+    ]
+    df["start"] = pd.to_datetime(df["date_start"])
+    # date_end inklusif: bar digambar sampai akhir hari terakhir
+    df["finish"] = pd.to_datetime(df["date_end"]) + timedelta(days=1)
+    df["label"] = df["project_name"] + " - " + df["customer_name"]
+    fig = px.timeline(
+        df, x_start="start", x_end="finish", y="label",
+        color="status", color_discrete_map=STATUS_COLORS,
+        hover_data={"pic": True, "category": True, "date_start": True, "date_end": True,
+                    "deadline": True, "start": False, "finish": False, "label": False},
+    )
+    fig.update_yaxes(autorange="reversed", title=None, categoryorder="array", categoryarray=list(df["label"]))
+    fig.update_xaxes(range=[month_start, month_end + timedelta(days=1)], title=None)
+    fig.update_layout(
+        height=max(250, ROW_HEIGHT * len(df) + 120),
+        legend_title_text="Status",
+        margin=dict(l=10, r=10, t=30, b=10),
+    )
+    return fig
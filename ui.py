@@ -0,0 +1,68 @@
+import os
+import html
+from functools import lru_cache
+import streamlit as st
+
+# UI HELPERS (dipakai bersama oleh semua varian app)
+
+def rerun():
+    # Streamlit lama hanya punya experimental_rerun
+    if hasattr(st, "rerun"):
+        st.rerun()
+    else:
+        st.experimental_rerun()
+
+def lazy_download_button(label, file_path, file_name, key, mime="application/octet-stream"):
+    # Render list file tidak membaca isi file sama sekali. File baru dibaca setelah
+    # tombol diklik, dan hanya satu file yang disiapkan dalam satu waktu.
+    if st.session_state.get('download_ready') == key:
+        if not os.path.exists(file_path):
+            # Bisa hilang setelah reconcile terakhir
+            st.error("File missing")
+            return
+        with open(file_path, "rb") as f:
+            if st.download_button(label, data=f, file_name=file_name, mime=mime, key=key):
+                st.session_state['download_ready'] = None
+    elif st.button(label, key=f"{key}_prepare"):
+        st.session_state['download_ready'] = key
+        rerun()
+
+def rendition_pending(key):
+    # Klik tombol cukup untuk memicu rerun; saat itu rendition biasanya sudah siap
+    st.info("⏳ Preview sedang disiapkan di background...")
+    st.button("🔄 Refresh preview", key=key)
+
+@lru_cache(maxsize=8)
+def marquee_html(ongoing_list, font_size="1.2em"):
+    # ongoing_list = snapshot tuple dari get_ongoing_projects_services (read cache);
+    # selama snapshot sama, HTML-nya tidak dirakit ulang
+    if ongoing_list:
+        running_text = " | ".join(
+            html.escape(f"{cat}: {name} (PIC: {pic})") for name, cat, pic in ongoing_list
+        )
+    else:
+        running_text = "Tidak ada project/service yang sedang berjalan saat ini."
+    return f"""
+    <marquee behavior="scroll" direction="left" style="
+        font-size:{font_size};
+        font-weight:bold;
+        color:#00BFFF;
+        background:#f0f8ff;
+        padding:8px 0;
+        border-radius:8px;
+        margin-bottom:10px;
+        letter-spacing:1px;">
+        {running_text}
+    </marquee>
+"""
+
+THEME_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "themes")
+
+@lru_cache(maxsize=None)
+def stylesheet_html(name):
+    # File CSS di themes/ dibaca sekali per proses lalu dikirim sebagai <style>
+    # (masih terkirim di setiap rerun, jadi isinya dijaga kecil; palet warna ada di
+    # [theme] .streamlit/config.toml). Static serving Streamlit mengirim .css sebagai
+    # text/plain + nosniff, jadi <link> ke app/static/ ditolak browser.
+    with open(os.path.join(THEME_ROOT, name), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
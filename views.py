@@ -0,0 +1,762 @@
+import os
+import base64
+from datetime import datetime
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from db import (
+    get_all_projects, get_project_details,
+    get_available_years, get_projects_for_month, get_project_options_for_year,
+    get_monthly_project_counts, BOARD_PAGE_SIZE,
+    search_projects, get_project_files, get_additional_files,
+    insert_project, update_project, remove_project,
+    add_project_file, remove_project_file,
+    REQUIRED_DOCUMENTS, get_required_documents_status
+)
+from board import BOARD_CATEGORIES, BOARD_STATUSES, build_board
+from timeline import (
+    STATUS_COLORS, get_active_projects, get_deadlines,
+    sort_by_urgency, deadline_label, build_gantt
+)
+from analytics import get_analytics
+from storage import (
+    MAX_UPLOAD_SIZE, UploadTooLarge, save_upload, place_upload, discard_upload,
+    build_zip_archive
+)
+from cleanup import schedule_file_cleanup
+from previews import (
+    PDF_PREVIEW_PAGES, SHEET_PREVIEW_ROWS, MAX_ORIGINAL_PREVIEW_SIZE,
+    get_rendition, list_sheets, get_sheet_preview, prepare_previews
+)
+from ui import rerun, lazy_download_button, rendition_pending
+
+# PAGES
+# Halaman-halaman dashboard yang dipakai bersama oleh app.py, app2.py, app3.py
+# dan app4.py. File app hanya mengatur layout (tab / sidebar menu), tema dan
+# login; semua logika halaman ada di sini supaya perbaikan berlaku ke semua varian.
+
+ADMIN_ONLY_MESSAGE = "Fitur ini hanya untuk admin (MAA)."
+STATUS_PROGRESS = {
+    "Not Started": 0,
+    "On Going": 50,
+    "Waiting BA": 80,
+    "Completed": 100
+}
+
+
+def init_session_state():
+    defaults = {
+        'show_edit_form': False,
+        'edit_project_id': None,
+        'view_files_project': None,
+        'active_tab': "📋 Board",
+        'force_tab': None,
+    }
+    for key, value in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = value
+
+def is_admin():
+    # Hanya app3 yang punya login; varian lain tidak membatasi fitur
+    return st.session_state.get('is_admin', True)
+
+# ADD PROJECT
+def add_project():
+    if not is_admin():
+        st.info(ADMIN_ONLY_MESSAGE)
+        return
+    with st.form(key='add_project_form'):
+        st.subheader("➕ Add New Project")
+        col1, col2 = st.columns(2)
+        with col1:
+            project_name = st.text_input("Project Name*")
+            customer_name = st.text_input("Customer Name*")
+            category = st.selectbox("Category*", ["SERVICE", "PROJECT"])
+            pic = st.text_input("PIC*")
+        with col2:
+            status = st.selectbox("Status*", ["Not Started", "On Going", "Completed", "Waiting BA"])
+            date_start = st.date_input("Start Date*")
+            date_end = st.date_input("End Date*")
+            no_po = st.text_input("PO Number")
+            no_bast = st.text_input("BAST Number")
+        if st.form_submit_button("💾 Save Project"):
+            if project_name and customer_name and category and pic and status and date_start and date_end:
+                if date_start > date_end:
+                    st.error("⚠️ Tanggal mulai harus sebelum tanggal selesai!")
+                else:
+                    try:
+                        insert_project(
+                            project_name, customer_name, category, pic, status,
+                            date_start, date_end, no_po, no_bast
+                        )
+                        st.success("✅ Project added successfully!")
+                        rerun()
+                    except Exception as e:
+                        st.error(f"⚠️ Error saat menambahkan proyek: {str(e)}")
+            else:
+                st.error("⚠️ Please fill all required fields (*)")
+
+
+# EDIT PROJECT
+def edit_project(project_id):
+    if not is_admin():
+        st.info(ADMIN_ONLY_MESSAGE)
+        return
+    project = get_project_details(project_id)
+    if not project:
+        st.error("⚠️ Project not found!")
+        return
+    if st.button("← Back to Board"):
+        st.session_state['show_edit_form'] = False
+        st.session_state['force_tab'] = "📋 Board"
+        rerun()
+    with st.form(key=f'edit_project_form_{project_id}'):
+        st.subheader(f"✏️ Editing: {project[1]}")
+        col1, col2 = st.columns(2)
+        with col1:
+            project_name = st.text_input("Project Name*", value=project[1])
+            customer_name = st.text_input("Customer Name*", value=project[2])
+            category = st.selectbox("Category*", ["SERVICE", "PROJECT"], 
+                                  index=0 if project[3] == "SERVICE" else 1)
+            pic = st.text_input("PIC*", value=project[4])
+        with col2:
+            status = st.selectbox("Status*", ["Not Started", "On Going", "Completed", "Waiting BA"], 
+                                index=["Not Started", "On Going", "Completed", "Waiting BA"].index(project[5]))
+            date_start = st.date_input("Start Date*", value=datetime.strptime(project[6], '%Y-%m-%d').date())
+            date_end = st.date_input("End Date*", value=datetime.strptime(project[7], '%Y-%m-%d').date())
+            no_po = st.text_input("PO Number", value=project[8])
+            no_bast = st.text_input("BAST Number", value=project[9])
+        if st.form_submit_button("💾 Update Project"):
+            update_project(
+                project_id, project_name, customer_name, category, pic, status,
+                date_start, date_end, no_po, no_bast
+            )
+            st.success("✅ Project updated successfully!")
+            st.session_state['show_edit_form'] = False
+            rerun()
+
+
+# DELETE PROJECT
+def delete_project(project_id):
+    if not is_admin():
+        st.info(ADMIN_ONLY_MESSAGE)
+        return
+    project = get_project_details(project_id)
+    if project:
+        st.warning(f"⚠️ Are you sure you want to delete project: {project[1]}?")
+        if st.button("🗑️ Confirm Delete"):
+            remove_project(project_id)
+            schedule_file_cleanup()
+            st.success("✅ Project and all related files deleted successfully!")
+            rerun()
+    else:
+        st.error("⚠️ Project not found")
+
+def edit_project_page():
+    st.subheader("✏️ Edit Project")
+    projects = get_all_projects()
+    if projects:
+        project_options = {f"{p[1]} - {p[2]}": p[0] for p in projects}
+        selected_project = st.selectbox("Select Project to Edit", list(project_options.keys()))
+        edit_project(project_options[selected_project])
+    else:
+        st.info("No projects available to edit")
+
+def delete_project_page():
+    st.subheader("🗑️ Delete Project")
+    projects = get_all_projects()
+    if projects:
+        project_options = {f"{p[1]} - {p[2]}": p[0] for p in projects}
+        selected_project = st.selectbox("Select Project to Delete", list(project_options.keys()))
+        delete_project(project_options[selected_project])
+    else:
+        st.info("No projects available to delete")
+
+
+# BOARD: PROJECT/SERVICE TAB
+def view_projects_kanban(card_style="expander"):
+    st.session_state['active_tab'] = "📋 Board"
+    st.subheader("📋 Project Board", divider="blue")
+    available_years = get_available_years()
+    if not available_years:
+        st.warning("No projects available")
+        return
+    current_year = datetime.now().strftime("%Y")
+    if 'selected_year' not in st.session_state:
+        st.session_state.selected_year = current_year if current_year in available_years else available_years[0]
+    if st.session_state.selected_year not in available_years:
+        st.session_state.selected_year = available_years[0]
+    selected_year = st.selectbox(
+        "Filter Year",
+        available_years,
+        index=available_years.index(st.session_state.selected_year),
+        key='year_selector'
+    )
+    if selected_year != st.session_state.selected_year:
+        st.session_state.selected_year = selected_year
+        rerun()
+    search_term = st.text_input("🔍 Search Projects...")
+    search_all_years = st.checkbox("Cari di semua tahun", key="search_all_years")
+    board_order = "deadline" if st.checkbox("Urutkan kartu berdasarkan deadline", key="board_by_deadline") else "start"
+    if search_term:
+        search_results = search_projects(search_term, None if search_all_years else selected_year)
+    else:
+        search_results = None
+    limits = {
+        (category, status): st.session_state.get(f"board_limit_{category}_{status}", BOARD_PAGE_SIZE)
+        for category in BOARD_CATEGORIES
+        for status in BOARD_STATUSES
+    }
+    board = build_board(selected_year, limits, search_results, board_order)
+    
+    tab_project, tab_service = st.tabs(["📁 PROJECT", "🛠️ SERVICE"])
+    with tab_project:
+        st.markdown("### 📁 List Project")
+        display_kanban(board, "PROJECT", card_style)
+    with tab_service:
+        st.markdown("### 🛠️ List Service")
+        display_kanban(board, "SERVICE", card_style)
+
+
+def _card_buttons(project):
+    col1, col2 = st.columns(2)
+    with col1:
+        if is_admin() and st.button(
+            "✏️ Edit Project", 
+            key=f"edit_btn_{project[0]}",
+            use_container_width=True
+        ):
+            st.session_state['edit_project_id'] = project[0]
+            st.session_state['show_edit_form'] = True
+            rerun()
+    with col2:
+        if st.button(
+            "📂 View Files",
+            key=f"view_files_{project[0]}",
+            use_container_width=True
+        ):
+            st.session_state.view_files_project = project[0]
+            st.session_state['force_tab'] = "📂 Manage Files"
+            rerun()
+
+def _expander_card(project, status, deadline, docs):
+    with st.expander(f"📌 {project[1]}"):
+        _card_buttons(project)
+        st.write(f"**Customer:** {project[2]}")
+        st.write(f"**Category:** {project[3]}")
+        st.write(f"**PIC:** {project[4]}")
+        st.write(f"**Period:** {project[6]} to {project[7]}")
+        st.write(deadline)
+        st.progress(STATUS_PROGRESS.get(status, 0))
+        st.write(f"**PO:** {project[8] or 'N/A'}")
+        st.write(f"**BAST:** {project[9] or 'N/A'}")
+        st.write(f"**Docs:** {docs}")
+
+def _html_card(project, status, deadline, docs):
+    # Style kartu ada di themes/theme-windows.css
+    st.markdown(f"""
+    <div class='kanban-card'>
+      <b>{project[1]}</b><br>
+      <span>Customer:</span> {project[2]}<br>
+      <span>PIC:</span> {project[4]}<br>
+      <span>Status:</span> {status}<br>
+      <span>Docs:</span> {docs}<br>
+      <span>Deadline:</span> {deadline}<br>
+    </div>
+    """, unsafe_allow_html=True)
+    _card_buttons(project)
+    st.progress(STATUS_PROGRESS.get(status, 0))
+
+CARD_STYLES = {"expander": _expander_card, "html": _html_card}
+
+def display_kanban(board, category, card_style="expander"):
+    render_card = CARD_STYLES[card_style]
+    columns = st.columns(len(BOARD_STATUSES))
+    completeness = board["completeness"]
+    for idx, status in enumerate(BOARD_STATUSES):
+        column = board["columns"][category][status]
+        with columns[idx]:
+            st.subheader(f"{status} ({column['count']})")
+            for project in column["projects"]:
+                render_card(
+                    project, status,
+                    deadline_label(board["deadlines"][project[0]], status),
+                    f"{completeness[project[0]]}/{len(REQUIRED_DOCUMENTS)}"
+                )
+            remaining = column["count"] - len(column["projects"])
+            if remaining > 0:
+                if st.button(f"⬇️ Load more ({remaining})", key=f"load_more_{category}_{status}", use_container_width=True):
+                    st.session_state[f"board_limit_{category}_{status}"] = len(column["projects"]) + BOARD_PAGE_SIZE
+                    rerun()
+
+
+# TIMELINE
+def view_timeline():
+    st.session_state['active_tab'] = "📅 Timeline"
+    st.subheader("📅 Monthly Project Timeline", divider="blue")
+    current_date = datetime.now()
+    months = ["January", "February", "March", "April", "May", "June",
+              "July", "August", "September", "October", "November", "December"]
+    col1, col2 = st.columns(2)
+    with col1:
+        selected_month = st.selectbox("Month", months, index=current_date.month-1)
+    with col2:
+        available_years = get_available_years() or [current_date.year]
+        selected_year = st.selectbox("Year", available_years, index=len(available_years)-1)
+    month_number = months.index(selected_month) + 1
+    col1, col2 = st.columns(2)
+    with col1:
+        mode = st.radio(
+            "Mode", ["📊 Gantt (aktif di bulan ini)", "📋 Mulai di bulan ini"],
+            horizontal=True, key="timeline_mode"
+        )
+    with col2:
+        by_urgency = st.checkbox("Urutkan berdasarkan deadline", key="timeline_by_urgency")
+    if mode.startswith("📊"):
+        active_projects = get_active_projects(selected_year, month_number)
+        if not active_projects:
+            st.info(f"📭 No active projects in {selected_month} {selected_year}")
+            return
+        deadlines = get_deadlines(active_projects)
+        if by_urgency:
+            active_projects = sort_by_urgency(active_projects, deadlines, status_index=5)
+        st.markdown(f"### 🗓️ {len(active_projects)} projects active in {selected_month} {selected_year}")
+        st.plotly_chart(build_gantt(active_projects, selected_year, month_number, deadlines), use_container_width=True)
+        return
+    projects = get_projects_for_month(selected_year, month_number)
+    if not projects:
+        st.info(f"📭 No projects in {selected_month} {selected_year}")
+        return
+    deadlines = get_deadlines(projects)
+    if by_urgency:
+        projects = sort_by_urgency(projects, deadlines, status_index=3)
+    st.markdown(f"### 🗓️ Projects in {selected_month} {selected_year}")
+    for project in projects:
+        with st.container(border=True):
+            cols = st.columns([4, 1, 1])
+            with cols[0]:
+                st.markdown(f"**{project[1]}**")
+                st.caption(f"👤 {project[3]} | 🏢 {project[2]}")
+                st.caption(f"📅 {project[4]} to {project[5]}")
+            status_color = STATUS_COLORS.get(project[3], "gray")
+            with cols[1]:
+                st.markdown(f"""<div style='color:white; background-color:{status_color}; 
+                              padding:0.2em 0.5em; border-radius:0.5em; text-align:center;'>
+                              {project[3]}</div>""", unsafe_allow_html=True)
+            with cols[2]:
+                st.caption(deadline_label(deadlines[project[0]], project[3]))
+
+
+# MANAGE FILES
+def store_upload(project_id, uploaded_file, file_name, file_category):
+    tmp_path, file_path, file_size, content_hash = save_upload(uploaded_file, file_name)
+    try:
+        # Blob baru ditaruh di transaksi insert row-nya (lihat db.add_project_file)
+        file_id = add_project_file(
+            project_id, file_name, file_path, file_category, content_hash, file_size,
+            place_file=lambda: place_upload(tmp_path, file_path)
+        )
+    finally:
+        discard_upload(tmp_path)
+    prepare_previews(file_path)
+    return file_id
+
+def preview_unavailable(file_path, file_name, key):
+    # File besar tanpa rendition tidak di-inline; cukup tawarkan download
+    st.info("Preview tidak tersedia untuk file ini.")
+    lazy_download_button("⬇️ Download", file_path, file_name, key=key)
+
+def manage_files(project_id=None):
+    st.session_state['active_tab'] = "📂 Manage Files"
+    BLOCKED_EXTENSIONS = ['.php', '.exe', '.bat', '.sh', '.js', '.py', '.jar']
+    if project_id is None:
+        available_years = get_available_years()
+        if not available_years:
+            st.warning("No projects available")
+            return
+        selected_year = st.selectbox("Filter by Year", available_years, index=0)
+        projects = get_project_options_for_year(selected_year)
+        if not projects:
+            st.info(f"No projects found for {selected_year}")
+            return
+        project_options = {f"{p[1]} - {p[2]}": p[0] for p in projects}
+        selected_project_name = st.selectbox("Select Project", list(project_options.keys()))
+        selected_project_id = project_options[selected_project_name]
+    else:
+        selected_project_id = project_id
+        project = get_project_details(selected_project_id)
+        selected_project_name = f"{project[1]} - {project[2]}"
+        st.write(f"Viewing files for: **{selected_project_name}**")
+        if st.button("← Back to Board"):
+            st.session_state.view_files_project = None
+            st.session_state['force_tab'] = "📋 Board"
+            rerun()
+    tab1, tab2, tab_preview = st.tabs(["📋 Required Documents", "📂 Additional Files", "📑 File Preview"])
+    with tab1:
+        required_files = REQUIRED_DOCUMENTS
+        if not is_admin():
+            st.info("Hanya admin (MAA) yang dapat upload dokumen.")
+        else:
+            st.markdown("<span class='upload-doc-title'>📤 Upload Required Documents</span>", unsafe_allow_html=True)
+            selected_category = st.selectbox("Document Type", required_files)
+            uploaded_file = st.file_uploader(
+                f"Choose {selected_category} file",
+                type=['pdf', 'doc', 'docx', 'xls', 'xlsx', 'jpg', 'jpeg', 'png'],
+                key=f"uploader_{selected_project_id}_{selected_category}"
+            )
+            if st.button("⬆️ Upload Required Document"):
+                if not uploaded_file:
+                    st.error("Please select a file")
+                else:
+                    file_extension = os.path.splitext(uploaded_file.name.lower())[1]
+                    if file_extension in BLOCKED_EXTENSIONS:
+                        st.error(f"⚠️ File type {file_extension} is not allowed for security reasons")
+                    elif uploaded_file.size > MAX_UPLOAD_SIZE:
+                        st.error("File size exceeds 10MB limit")
+                    else:
+                        try:
+                            store_upload(selected_project_id, uploaded_file, uploaded_file.name, selected_category)
+                            st.success(f"✅ {selected_category} uploaded successfully!")
+                        except Exception as e:
+                            st.error(f"⚠️ Error saat mengupload file: {str(e)}")
+                        rerun()
+        st.markdown("### 📌 Existing Required Documents Status")
+        document_status = get_required_documents_status(selected_project_id)
+        for category in required_files:
+            uploaded_files = document_status[category]
+            if uploaded_files:
+                st.markdown(f"**{category}**: ✅ (Uploaded)")
+            else:
+                st.markdown(f"**{category}**: ❌ (Not Uploaded)")
+    with tab2:
+        st.markdown("### 📂 Upload Additional Files")
+        if not is_admin():
+            st.info("Hanya admin (MAA) yang dapat upload file tambahan.")
+        else:
+            custom_category = st.text_input("Custom File Name*",
+                        placeholder="e.g. Meeting Notes, Contract Draft",
+                        help="Nama deskriptif untuk file ini")
+            uploaded_custom_file = st.file_uploader(
+                f"Choose additional file for {selected_project_name} (Max 10MB)",
+                type=[
+                    'pdf', 'doc', 'docx', 'xls', 'xlsx', 
+                    'jpg', 'jpeg', 'png', 'txt', 'ppt', 'pptx'
+                ],
+                key=f"additional_{selected_project_id}"
+            )
+            if st.button("⬆️ Upload Additional File"):
+                if not custom_category:
+                    st.error("Please enter a file name")
+                elif not uploaded_custom_file:
+                    st.error("Please select a file")
+                else:
+                    file_name = uploaded_custom_file.name.lower()
+                    file_extension = os.path.splitext(file_name)[1]
+                    if file_extension in BLOCKED_EXTENSIONS:
+                        st.error(f"⚠️ File type {file_extension} is not allowed for security reasons")
+                    elif uploaded_custom_file.size > MAX_UPLOAD_SIZE:
+                        st.error("File size exceeds 10MB limit")
+                    else:
+                        safe_filename = "".join(
+                            c for c in uploaded_custom_file.name 
+                            if c.isalnum() or c in ('.', '-', '_')
+                        ).rstrip()
+                        try:
+                            store_upload(
+                                selected_project_id,
+                                uploaded_custom_file,
+                                safe_filename,
+                                f"Additional: {custom_category}"
+                            )
+                        except UploadTooLarge as e:
+                            st.error(str(e))
+                            st.stop()
+                        st.success(f"✅ File '{custom_category}' uploaded successfully!")
+                        rerun()
+        st.markdown("### 📌 Existing Additional Files")
+        additional_files = get_additional_files(selected_project_id)
+        if additional_files:
+            for idx, file in enumerate(additional_files):
+                cols = st.columns([5, 1, 1])
+                with cols[0]:
+                    display_name = file[3].replace("Additional: ", "")
+                    st.markdown(f"**{display_name}**: `{file[1]}`")
+                    if file[4] is not None:
+                        st.caption(f"{file[4] / 1024:.2f} KB")
+                with cols[1]:
+                    if not file[5]:
+                        lazy_download_button("Download", file[2], file[1], key=f"dl_add_{file[0]}_{idx}")
+                    else:
+                        st.warning("Missing")
+                with cols[2]:
+                    if is_admin() and st.button("🗑️", key=f"del_add_{file[0]}_{idx}"):
+                        try:
+                            remove_project_file(file[0])
+                            schedule_file_cleanup()
+                            st.success("✅ File deleted successfully!")
+                            rerun()
+                        except Exception as e:
+                            st.error(f"Error deleting: {str(e)}")
+        else:
+            st.info("No additional files uploaded yet")
+    with tab_preview:
+        st.markdown(f"### 📑 File Preview: {selected_project_name}")
+        col1, col2 = st.columns(2)
+        with col1:
+            file_type = st.selectbox(
+                "Filter File Type",
+                ["All", "Required Documents", "Additional Files"],
+                key="file_type_filter"
+            )
+        with col2:
+            search_query = st.text_input("🔍 Search by filename")
+        files = get_project_files(selected_project_id, file_type, search_query)
+        if files:
+            if st.button("🗂️ Download All Files as ZIP"):
+                zip_file, missing_files = build_zip_archive([(file[0], file[1]) for file in files])
+                for file_name in missing_files:
+                    st.warning(f"File not found: {file_name}")
+                with zip_file:
+                    st.download_button(
+                        label="⬇️ Download ZIP Now",
+                        data=zip_file,
+                        file_name=f"{selected_project_name}_files.zip",
+                        mime="application/zip",
+                        key="download_all_zip"
+                    )
+        if not files:
+            st.info("No files found matching your criteria")
+        else:
+            for idx, file in enumerate(files):
+                file_name, file_path, file_category, file_id, file_size, file_missing = file
+                file_ext = os.path.splitext(file_name)[1].lower()
+                with st.expander(f"📄 {file_name} ({file_category})"):
+                    col1, col2, col3, col4 = st.columns([4, 1, 1, 1])
+                    with col1:
+                        st.markdown(f"**Type:** {file_category}")
+                        if file_missing:
+                            st.markdown("**Size:** File missing")
+                        elif file_size is not None:
+                            st.markdown(f"**Size:** {file_size / 1024:.2f} KB")
+                    with col2:
+                        if file_ext in ['.pdf', '.jpg', '.jpeg', '.png', '.txt', '.xls', '.xlsx']:
+                            if st.button("👁️ Preview", key=f"preview_{file_id}"):
+                                st.session_state['preview_file'] = file_path
+                    with col3:
+                        if not file_missing:
+                            lazy_download_button("⬇️ Download", file_path, file_name, key=f"download_{file_id}")
+                        else:
+                            st.error("File missing")
+                    with col4:
+                        if is_admin() and st.button("❌ Delete", key=f"delete_{file_id}"):
+                            with st.spinner("Deleting..."):
+                                try:
+                                    remove_project_file(file_id)
+                                    schedule_file_cleanup()
+                                    st.success(f"Deleted: {file_name}")
+                                    rerun()
+                                except Exception as e:
+                                    st.error(f"Error: {str(e)}")
+                    # PREVIEW BLOCK (sudah support Excel)
+                    if st.session_state.get('preview_file') == file_path:
+                        st.markdown("---")
+                        st.markdown("### File Preview")
+                        if file_missing:
+                            st.error("File not found on server")
+                        elif file_ext == '.pdf':
+                            status, preview_path = get_rendition(file_path)
+                            if status == "pending":
+                                rendition_pending(key=f"refresh_preview_{file_id}")
+                            elif status == "no_preview":
+                                preview_unavailable(file_path, file_name, key=f"preview_dl_{file_id}")
+                            else:
+                                if status == "ready":
+                                    st.caption(f"Preview maksimal {PDF_PREVIEW_PAGES} halaman pertama")
+                                with open(preview_path, "rb") as f:
+                                    base64_pdf = base64.b64encode(f.read()).decode('utf-8')
+                                    pdf_display = f"""
+                                        <iframe 
+                                            src="data:application/pdf;base64,{base64_pdf}" 
+                                            width="100%" 
+                                            height="500px" 
+                                            style="border:1px solid #eee;"
+                                        ></iframe>
+                                    """
+                                    st.markdown(pdf_display, unsafe_allow_html=True)
+                        elif file_ext in ['.jpg', '.jpeg', '.png']:
+                            status, preview_path = get_rendition(file_path)
+                            if status == "pending":
+                                rendition_pending(key=f"refresh_preview_{file_id}")
+                            elif status == "no_preview":
+                                preview_unavailable(file_path, file_name, key=f"preview_dl_{file_id}")
+                            else:
+                                st.image(preview_path, use_column_width=True)
+                        elif file_ext == '.txt':
+                            try:
+                                # Flag file_missing bisa tertinggal dari reconcile terakhir
+                                with open(file_path, "r", errors="replace") as f:
+                                    st.text_area("Content", f.read(MAX_ORIGINAL_PREVIEW_SIZE), height=200)
+                            except FileNotFoundError:
+                                st.error("File not found on server")
+                        elif file_ext in ['.xls', '.xlsx']:
+                            try:
+                                status, sheet_names = list_sheets(file_path)
+                                if status == "ready":
+                                    sheet_index = 0
+                                    if len(sheet_names) > 1:
+                                        sheet_index = st.selectbox(
+                                            "Sheet", range(len(sheet_names)),
+                                            format_func=lambda index: sheet_names[index],
+                                            key=f"preview_sheet_{file_id}"
+                                        )
+                                    status, preview_path = get_sheet_preview(file_path, sheet_index)
+                                if status == "pending":
+                                    rendition_pending(key=f"refresh_preview_{file_id}")
+                                elif status != "ready":
+                                    # Render gagal: tidak dibaca ulang di script thread
+                                    preview_unavailable(file_path, file_name, key=f"preview_dl_{file_id}")
+                                else:
+                                    st.caption(f"Preview maksimal {SHEET_PREVIEW_ROWS} baris pertama")
+                                    st.dataframe(pd.read_csv(preview_path))
+                            except Exception as e:
+                                st.error(f"Gagal preview Excel: {str(e)}")
+                        else:
+                            st.warning("Preview not available for this file type")
+
+
+# CHART
+def dashboard_line_chart():
+    st.header("📈 Statistik Proyek: Line Chart Per Bulan & Per Tahun")
+
+    # Ambil agregat per bulan dari database (sudah di-cache, bukan seluruh tabel)
+    df = pd.DataFrame(get_monthly_project_counts(), columns=['year', 'month', 'jumlah'])
+
+    if df.empty:
+        st.info("Belum ada data proyek.")
+        return
+
+    # ---- Grafik Per Bulan (Tahun Terpilih) ----
+    st.subheader("Jumlah Proyek Per Bulan (Tahun Terpilih)")
+    tahun_opsi = sorted(df['year'].unique())
+    tahun_pilih = st.selectbox("Pilih Tahun", tahun_opsi, index=len(tahun_opsi)-1)
+
+    per_bulan = df[df['year'] == tahun_pilih][['month', 'jumlah']].copy()
+    bulan_nama = [
+        "Januari", "Februari", "Maret", "April", "Mei", "Juni",
+        "Juli", "Agustus", "September", "Oktober", "November", "Desember"
+    ]
+    per_bulan['Bulan'] = per_bulan['month'].apply(lambda x: bulan_nama[x-1])
+
+    fig_bulan = px.line(
+        per_bulan, 
+        x='Bulan', y='jumlah', 
+        markers=True,
+        title=f"Jumlah Proyek per Bulan di Tahun {tahun_pilih}"
+    )
+    fig_bulan.update_layout(xaxis_title="Bulan", yaxis_title="Jumlah Proyek")
+    st.plotly_chart(fig_bulan, use_container_width=True)
+
+    st.subheader("Jumlah Proyek Per Tahun")
+    per_tahun = df.groupby('year', as_index=False)['jumlah'].sum()
+
+    fig_tahun = px.line(
+        per_tahun,
+        x='year', y='jumlah',
+        markers=True,
+        title="Jumlah Proyek per Tahun"
+    )
+    fig_tahun.update_layout(xaxis_title="Tahun", yaxis_title="Jumlah Proyek")
+    st.plotly_chart(fig_tahun, use_container_width=True)
+
+
+# ANALYTICS
+def view_analytics():
+    st.header("📊 Analytics Proyek")
+    if not get_all_projects():
+        st.info("Belum ada data proyek.")
+        return
+    analytics = get_analytics(datetime.now().strftime("%Y-%m-%d"))
+
+    st.subheader("On Time vs Late")
+    on_time = analytics["on_time"]
+    cols = st.columns(len(on_time))
+    for col, (label, count) in zip(cols, on_time.items()):
+        col.metric(label, int(count))
+    if not analytics["on_time_projects"].empty:
+        with st.expander("Detail project"):
+            st.dataframe(
+                analytics["on_time_projects"][["project_name", "pic", "status", "date_end", "completed_at", "result"]],
+                use_container_width=True
+            )
+
+    st.subheader("Cycle Time per Status (hari)")
+    cycle = analytics["cycle_time"].reset_index()
+    fig_cycle = px.bar(cycle, x="status", y="median", hover_data=["mean", "count"], title="Median lama di setiap status")
+    fig_cycle.update_layout(xaxis_title="Status", yaxis_title="Hari")
+    st.plotly_chart(fig_cycle, use_container_width=True)
+
+    st.subheader("Work In Progress per Bulan")
+    if analytics["wip"].empty:
+        st.info("Belum ada project yang berjalan.")
+    else:
+        fig_wip = px.line(analytics["wip"], x="month", y="wip", markers=True, title="Project On Going / Waiting BA di akhir bulan")
+        fig_wip.update_layout(xaxis_title="Bulan", yaxis_title="Jumlah Proyek")
+        st.plotly_chart(fig_wip, use_container_width=True)
+
+    st.subheader("Beban per PIC")
+    st.dataframe(analytics["pic_load"], use_container_width=True)
+
+
+# NAVIGATION
+PAGES = {
+    "📈 Grafik Proyek": dashboard_line_chart,
+    "📊 Analytics": view_analytics,
+    "📋 Board": view_projects_kanban,
+    "📅 Timeline": view_timeline,
+    "➕ Add Project": add_project,
+    "✏️ Edit Project": edit_project_page,
+    "🗑️ Delete Project": delete_project_page,
+    "📂 Manage Files": manage_files,
+}
+ADMIN_PAGES = ["➕ Add Project", "✏️ Edit Project", "🗑️ Delete Project"]
+
+def visible_pages(tab_names):
+    # Tanpa hak admin, halaman CRUD tidak ditampilkan sama sekali
+    return [name for name in tab_names if is_admin() or name not in ADMIN_PAGES]
+
+def apply_forced_tab():
+    # Tombol "Back"/"View Files" meminta pindah tab lewat force_tab
+    if st.session_state.get('force_tab'):
+        st.session_state['active_tab'] = st.session_state['force_tab']
+        st.session_state['force_tab'] = None
+        rerun()
+
+def show_detail_page():
+    """Form edit / file satu project tampil menggantikan tab.
+    Return True kalau salah satunya sedang ditampilkan."""
+    if st.session_state['show_edit_form']:
+        edit_project(st.session_state['edit_project_id'])
+        return True
+    if st.session_state.view_files_project:
+        project_id = st.session_state.view_files_project
+        project_details = get_project_details(project_id)
+        if project_details:
+            st.subheader(f"📂 Files for: {project_details[1]}")
+            manage_files(project_id=project_id)
+            return True
+        st.error("Project not found")
+        st.session_state.view_files_project = None
+    return False
+
+def render_tabs(tab_names):
+    tab_names = visible_pages(tab_names)
+    tabs = st.tabs(tab_names)
+    default_index = tab_names.index("📋 Board") if "📋 Board" in tab_names else 0
+    active_index = tab_names.index(st.session_state['active_tab']) if st.session_state['active_tab'] in tab_names else default_index
+    # This forces the correct tab to be active
+    tabs[active_index].write("")
+    for tab, name in zip(tabs, tab_names):
+        with tab:
+            PAGES[name]()